@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from models import *
-from peewee import fn
+from peewee import fn, prefetch
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def calculate_itemwise_production_dates(delivery_date, items, allow_sunday=True):
@@ -60,6 +63,14 @@ def generate_subscription_orders(order):
     
     return orders
 
+def on_weekday(date_field, weekday):
+    """
+    Condition that date_field falls on weekday (0 = Monday, as
+    date.weekday()), for the database to check. SQLite's strftime('%w')
+    counts from Sunday = 0.
+    """
+    return fn.strftime('%w', date_field) == str((weekday + 1) % 7)
+
 def get_delivery_schedule(start_date=None, end_date=None):
     """
     Get delivery schedule for the given date range.
@@ -77,15 +88,38 @@ def get_delivery_schedule(start_date=None, end_date=None):
         query = query.where((Order.delivery_date >= start_date) & 
                           (Order.delivery_date <= end_date))
     
-    # Return all orders in the date range
-    return list(query.order_by(Order.delivery_date))
+    # Return all orders in the date range, with their order items and items
+    # prefetched (the items joined to the order items, so two queries in
+    # total) so callers can walk order.order_items / order_item.item
+    # without a query per row
+    order_items = OrderItem.select(OrderItem, Item).join(Item)
+    return list(prefetch(query.order_by(Order.delivery_date), order_items))
+
+def get_delivery_schedule_flat(start_date, end_date):
+    """
+    Flat variant of get_delivery_schedule for display, without model objects:
+    one (order id, delivery date, customer name, item name, amount) tuple per
+    order item, ordered by delivery date and order. Orders without items are
+    left out.
+    """
+    query = (OrderItem
+             .select(Order.id, Order.delivery_date, Customer.name, Item.name, OrderItem.amount)
+             .join(Order)
+             .join(Customer)
+             .switch(OrderItem)
+             .join(Item)
+             .where((Order.delivery_date >= start_date) &
+                    (Order.delivery_date <= end_date))
+             .order_by(Order.delivery_date, Order.id))
+    return list(query.tuples())
 
-def get_production_plan(start_date=None, end_date=None):
+def get_production_plan(start_date=None, end_date=None, item=None):
     """
     Get production plan for the given date range.
     
     The application now correctly creates orders with the right subscription pattern,
     so we should simply display all orders in the database for the requested date range.
+    If item is given, only the rows for that item are returned.
     """
     query = (OrderItem.select(
         OrderItem.transfer_date,
@@ -110,6 +144,9 @@ def get_production_plan(start_date=None, end_date=None):
         query = query.where((OrderItem.production_date >= start_date) & 
                           (OrderItem.production_date <= end_date))
     
+    if item is not None:
+        query = query.where(Item.id == item.id)
+    
     # Return all results without subscription filtering
     results = list(query)
     
@@ -130,6 +167,24 @@ def get_production_plan(start_date=None, end_date=None):
     
     return results
 
+# Results of get_transfer_schedule by (start_date, end_date), valid for
+# the database state identified by _transfer_schedule_version
+_transfer_schedule_cache = {}
+_transfer_schedule_version = None
+
+def data_version():
+    """
+    Return a value that changes whenever the database content changes:
+    the connection, the rows written on it and SQLite's data_version,
+    which moves when another connection commits. Returns None while a
+    transaction is open. Reading data_version is a PRAGMA query, so every
+    cache lookup keyed on this costs one (cheap) query.
+    """
+    conn = db.connection()
+    if conn.in_transaction:
+        return None
+    return id(conn), conn.total_changes, db.execute_sql('PRAGMA data_version').fetchone()[0]
+
 def get_transfer_schedule(start_date=None, end_date=None):
     """
     Gibt für jeden Transfer-Tag die Gesamtmenge pro Artikel zurück,
@@ -142,7 +197,20 @@ def get_transfer_schedule(start_date=None, end_date=None):
     if isinstance(end_date, datetime):
         end_date = end_date.date()
 
-    print("[DEBUG] get_transfer_schedule -> Zeitfenster:", start_date, "bis", end_date)
+    logger.debug("get_transfer_schedule -> Zeitfenster: %s bis %s", start_date, end_date)
+
+    # Reuse the result of an earlier call for the same range as long as
+    # nothing in the database changed since then. Inside a transaction the
+    # changes may still be rolled back, so the cache is bypassed there.
+    global _transfer_schedule_version
+    version = data_version()
+    if version != _transfer_schedule_version:
+        _transfer_schedule_cache.clear()
+        _transfer_schedule_version = version
+    use_cache = version is not None
+    cached = _transfer_schedule_cache.get((start_date, end_date)) if use_cache else None
+    if cached is not None:
+        return [dict(row) for row in cached]
 
     query = (OrderItem
              .select(
@@ -161,13 +229,15 @@ def get_transfer_schedule(start_date=None, end_date=None):
     results = []
     for row in query:
         item_name = row.item.name if row.item else "Unbekannt"
-        print("[DEBUG] MATCHED transfer:", item_name, row.transfer_date, row.total_amount)
+        logger.debug("MATCHED transfer: %s %s %s", item_name, row.transfer_date, row.total_amount)
         results.append({
             "date": row.transfer_date,
             "item": item_name,
             "amount": row.total_amount
         })
 
+    if use_cache:
+        _transfer_schedule_cache[(start_date, end_date)] = [dict(row) for row in results]
     return results
 
 
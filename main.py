@@ -1,14 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta, date
-from models import Item, Order, Customer, OrderItem, db
-from database import calculate_itemwise_production_dates, generate_subscription_orders, get_delivery_schedule, get_production_plan, get_transfer_schedule
-from peewee import fn, JOIN
+from models import Item, Order, Customer, OrderItem, db, create_tables, SUBSCRIPTION_LABELS
+from database import calculate_itemwise_production_dates, generate_subscription_orders, get_delivery_schedule, get_production_plan, get_transfer_schedule, on_weekday
+from peewee import fn, JOIN, prefetch
 import uuid
-from weekly_view import WeeklyDeliveryView, WeeklyProductionView, WeeklyTransferView
+from weekly_view import WeeklyDeliveryView, WeeklyProductionView, WeeklyTransferView, parse_date
 from customers_view import CustomerView
 from item_view import ItemView
-from widgets import AutocompleteCombobox
+from widgets import AutocompleteCombobox, CompletionIndex
 from print_schedules import SchedulePrinter, ask_week_selection
 import os
 import requests
@@ -18,6 +18,10 @@ import subprocess
 import json
 import copy
 import time
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
 
 # Check for updates
 VERSION = "1.0"  # Current version of the application
@@ -67,11 +71,11 @@ class ProductionApp(tk.Tk):
     def initialize_produktionsview(self):
         # Check if 'produktionsview' is created and properly assigned
         if not hasattr(self, 'produktionsview'):
-            print("[DEBUG] 'produktionsview' not found. Initializing...")
+            logger.debug("'produktionsview' not found. Initializing...")
             self.produktionsview = WeeklyProductionView(self)
         else:
-            print("[DEBUG] 'produktionsview' already initialized.")
-            print("[DEBUG] Initializing 'produktionsview' view.")
+            logger.debug("'produktionsview' already initialized.")
+            logger.debug("Initializing 'produktionsview' view.")
             self.produktionsview = WeeklyProductionView(self)
 
     def __init__(self):
@@ -130,6 +134,9 @@ class ProductionApp(tk.Tk):
         
         self.notebook.pack(expand=True, fill='both', padx=10, pady=5)
         
+        # Add what is missing from an older database, e.g. new indexes
+        create_tables()
+        
         self.load_data()
         self.create_order_tab()
         self.create_delivery_tab()
@@ -149,10 +156,10 @@ class ProductionApp(tk.Tk):
 
     def throttled_refresh(self):
         """Refresh all views but enforce a minimum time between refreshes to prevent flickering"""
-        current_time = int(time.time() * 1000)  # Current time in ms
+        current_time = time.monotonic_ns() // 1_000_000  # Monotonic time in ms
         if current_time - self.last_refresh > self.refresh_throttle:
             self.last_refresh = current_time
-            print("[DEBUG] UI refresh triggered")
+            logger.debug("UI refresh triggered")
             self.refresh_tables()
             self.refresh_button.config(state='disabled')  # Temporarily disable button
             # Re-enable button after throttle period
@@ -649,12 +656,16 @@ class ProductionApp(tk.Tk):
                 print(f"Order data: {order_dict}")
                 raise
 
-    def serialize_order(self, order):
-        """Serialize an order instance for the undo system"""
+    def serialize_order(self, order, order_items=None):
+        """Serialize an order instance for the undo system
+
+        order_items may give the order's items when they were already
+        loaded; by default they are queried through order.order_items.
+        """
         order_data = {
             'id': order.id,
             'order_id': str(order.order_id),  # Convert UUID to string
-            'customer_id': order.customer.id,
+            'customer_id': order.customer_id,
             'delivery_date': order.delivery_date,
             #aay 'production_date': item.production_date,
             'from_date': order.from_date,
@@ -673,10 +684,12 @@ class ProductionApp(tk.Tk):
                 order_data[key] = str(value)
         
         # Add order items
-        for item in order.order_items:
+        if order_items is None:
+            order_items = order.order_items
+        for item in order_items:
             order_data['order_items'].append({
                 'id': item.id,
-                'item_id': item.item.id,
+                'item_id': item.item_id,
                 'amount': item.amount
             })
         
@@ -684,7 +697,20 @@ class ProductionApp(tk.Tk):
 
     def collect_orders_data(self, orders):
         """Collect data for multiple orders for the undo system"""
-        return [self.serialize_order(order) for order in orders]
+        orders = list(orders)
+        if not orders:
+            return []
+
+        # The items of all the orders in one query, grouped by order
+        items_by_order = defaultdict(list)
+        order_items = (OrderItem
+                       .select()
+                       .where(OrderItem.order.in_([order.id for order in orders]))
+                       .order_by(OrderItem.id))
+        for order_item in order_items:
+            items_by_order[order_item.order_id].append(order_item)
+
+        return [self.serialize_order(order, items_by_order[order.id]) for order in orders]
 
     # Add this method
     def create_items_tab(self):
@@ -877,6 +903,10 @@ class ProductionApp(tk.Tk):
     def load_data(self):
         self.items = {item.name: item for item in Item.select()}
         self.customers = {customer.name: customer for customer in Customer.select()}
+        # Sorted names for the autocomplete boxes, indexed once and shared by
+        # all of them until the next load_data
+        self.item_completion = CompletionIndex(sorted(self.items))
+        self.customer_completion = CompletionIndex(sorted(self.customers))
         self.order_items = []  # List to store items for current order
     
     def on_customer_select(self, event):
@@ -1006,7 +1036,7 @@ class ProductionApp(tk.Tk):
 
                 ttk.Label(item_row_frame, text="Artikel:").pack(side='left', padx=5)
                 item_cb = AutocompleteCombobox(item_row_frame, width=20)
-                item_cb.set_completion_list(sorted(self.items.keys()))
+                item_cb.set_completion_index(self.item_completion)
                 item_cb.pack(side='left', padx=5)
                 if existing_order_item:
                     item_cb.set(existing_order_item.item.name)
@@ -1081,9 +1111,7 @@ class ProductionApp(tk.Tk):
                                 today = datetime.now().date()
                                 
                                 # Get the items in this order to compare with other orders
-                                current_order_items = set()
-                                for order_item in existing_order.order_items:
-                                    current_order_items.add(order_item.item.id)
+                                current_order_items = frozenset(order_item.item_id for order_item in existing_order.order_items)
                                 
                                 # Get weekday of the current order
                                 current_weekday = existing_order.delivery_date.weekday()
@@ -1093,24 +1121,24 @@ class ProductionApp(tk.Tk):
                                     f"Sind Sie sicher, dass Sie diese Lieferung und alle zukünftigen Lieferungen für {existing_order.customer.name} am gleichen Wochentag löschen möchten?\n\n"
                                     f"Es werden nur Bestellungen mit identischen Artikeln gelöscht."):
                                     
-                                    # First get all future orders for the same customer on same weekday
-                                    future_orders_query = Order.select().where(
+                                    # First get all future orders for the same customer on same weekday,
+                                    # with their order items fetched in one more query
+                                    future_orders_query = prefetch(Order.select().where(
                                         (Order.customer == existing_order.customer) &
-                                        (Order.delivery_date >= today)
-                                    )
+                                        (Order.delivery_date >= today) &
+                                        on_weekday(Order.delivery_date, current_weekday)
+                                    ), OrderItem)
                                     
-                                    # Filter for same weekday and same items
+                                    # Filter for same items
                                     matching_orders = []
                                     
                                     for order in future_orders_query:
-                                        # Check if same weekday
-                                        if order.delivery_date.weekday() != current_weekday:
-                                            continue
-                                            
                                         # Check if has the same items
-                                        order_items = set()
-                                        for order_item in order.order_items:
-                                            order_items.add(order_item.item.id)
+                                        # (with fewer items than the current order has distinct ones it cannot)
+                                        future_items = order.order_items
+                                        if len(future_items) < len(current_order_items):
+                                            continue
+                                        order_items = {order_item.item_id for order_item in future_items}
                                             
                                         # Only include if items match exactly (same count and same IDs)
                                         if order_items == current_order_items:
@@ -1186,8 +1214,8 @@ class ProductionApp(tk.Tk):
                 
                 # Convert to date objects for saving
                 try:
-                    overall_from = datetime.strptime(overall_from_str, "%d.%m.%Y").date() if "." in overall_from_str else datetime.strptime(overall_from_str, "%Y-%m-%d").date()
-                    overall_to = datetime.strptime(overall_to_str, "%d.%m.%Y").date() if "." in overall_to_str else datetime.strptime(overall_to_str, "%Y-%m-%d").date()
+                    overall_from = parse_date(overall_from_str) if "." in overall_from_str else datetime.strptime(overall_from_str, "%Y-%m-%d").date()
+                    overall_to = parse_date(overall_to_str) if "." in overall_to_str else datetime.strptime(overall_to_str, "%Y-%m-%d").date()
                 except ValueError:
                     messagebox.showerror("Fehler", "Ungültiges Datumsformat. Verwenden Sie entweder dd.mm.yyyy oder yyyy-mm-dd.")
                     return
@@ -1196,7 +1224,7 @@ class ProductionApp(tk.Tk):
                 def validate_amount(amount_str, item_name):
                     try:
                         # First check for subscription type strings
-                        if amount_str in ["Wöchentlich", "Zweiwöchentlich", "Alle 3 Wochen", "Alle 4 Wochen", "Kein Abonnement"]:
+                        if amount_str in SUBSCRIPTION_LABELS:
                             return False, f"Ungültige Menge: '{amount_str}' scheint ein Abonnementtyp zu sein statt einer Zahl für Artikel {item_name}"
                         
                         # Support European decimal format (comma instead of period)
@@ -1236,7 +1264,7 @@ class ProductionApp(tk.Tk):
                         for row in order_rows:
                             delivery_date_str = row['delivery_entry'].get()
                             try:
-                                delivery_date = datetime.strptime(delivery_date_str, "%d.%m.%Y").date()
+                                delivery_date = parse_date(delivery_date_str)
                             except ValueError:
                                 messagebox.showerror("Fehler", f"Ungültiges Datumsformat: {delivery_date_str}. Verwenden Sie dd.mm.yyyy.")
                                 return
@@ -1282,8 +1310,7 @@ class ProductionApp(tk.Tk):
                                 existing_order.save()
                                 
                                 # Delete existing order items for this order
-                                for oi in existing_order.order_items:
-                                    oi.delete_instance()
+                                OrderItem.delete().where(OrderItem.order == existing_order).execute()
                                 
                                 # Create new order items
                                 for item_name, amount in order_items_data:
@@ -1401,7 +1428,7 @@ class ProductionApp(tk.Tk):
                 messagebox.showinfo("Erfolg", "Bestellungen erfolgreich aktualisiert!")
                 edit_window.destroy()
                 self.on_customer_select(None)  # Refresh orders list
-                print("[DEBUG] UI refresh triggered")
+                logger.debug("UI refresh triggered")
                 self.refresh_tables()  # Refresh all views
                 
             except Exception as e:
@@ -1410,13 +1437,16 @@ class ProductionApp(tk.Tk):
         save_btn = ttk.Button(buttons_frame, text="Alle Änderungen speichern", command=save_all_changes)
         save_btn.pack(side="right", padx=5)
 
-        # Add mouse wheel binding to the canvas for better scrolling
+        # Add mouse wheel binding to the canvas for better scrolling. It is
+        # bound on this window, which is in the bindtags of all its widgets,
+        # not with bind_all: that would replace the handlers of the weekly
+        # views and keep scrolling this canvas after the window is closed
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)  # Windows and macOS
-        canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))  # Linux
-        canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))  # Linux
+        edit_window.bind("<MouseWheel>", _on_mousewheel)  # Windows and macOS
+        edit_window.bind("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))  # Linux
+        edit_window.bind("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))  # Linux
             
     def create_order_tab(self):
         # Customer Frame
@@ -1425,7 +1455,7 @@ class ProductionApp(tk.Tk):
         
         ttk.Label(customer_frame, text="Kunde:").pack(side='left', padx=5)
         self.customer_combo = AutocompleteCombobox(customer_frame, width=50)
-        self.customer_combo.set_completion_list(sorted(self.customers.keys()))
+        self.customer_combo.set_completion_index(self.customer_completion)
         self.customer_combo.pack(side='left', padx=5, fill='x', expand=True)
         
         # Items Frame
@@ -1438,7 +1468,7 @@ class ProductionApp(tk.Tk):
         
         ttk.Label(add_frame, text="Artikel:").pack(side='left', padx=5)
         self.item_combo = AutocompleteCombobox(add_frame, width=30)
-        self.item_combo.set_completion_list(sorted(self.items.keys()))
+        self.item_combo.set_completion_index(self.item_completion)
         self.item_combo.pack(side='left', padx=5)
         
         ttk.Label(add_frame, text="Menge:").pack(side='left', padx=5)
@@ -1794,7 +1824,8 @@ class ProductionApp(tk.Tk):
                         production_date=production_date,
                         transfer_date=transfer_date,
                     )
-                    print(f"[DEBUG] Created OrderItem: {item_data['item'].name}, Prod: {production_date}, Trans: {transfer_date}, Amount: {item_data['amount']}")
+                    logger.debug("Created OrderItem: %s, Prod: %s, Trans: %s, Amount: %s",
+                                 item_data['item'].name, production_date, transfer_date, item_data['amount'])
                 
                 # Generate subscription orders if applicable
                 if self.sub_var.get() > 0:
@@ -1829,7 +1860,9 @@ class ProductionApp(tk.Tk):
             
             messagebox.showinfo("Erfolg", "Bestellung erfolgreich gespeichert!")
             self.clear_form()
-            print("[DEBUG] UI refresh triggered")
+            if hasattr(self, 'delivery_view'):
+                self.delivery_view.invalidate_cache()
+            logger.debug("UI refresh triggered")
             self.refresh_tables()  # Refresh all views after saving the order
             
         except Exception as e:
@@ -1903,7 +1936,8 @@ class ProductionApp(tk.Tk):
                         production_date=production_date,
                         transfer_date=transfer_date,
                     )
-                    print(f"[DEBUG] Created OrderItem: {item_data['item'].name}, Prod: {production_date}, Trans: {transfer_date}, Amount: {item_data['amount']}")
+                    logger.debug("Created OrderItem: %s, Prod: %s, Trans: %s, Amount: %s",
+                                 item_data['item'].name, production_date, transfer_date, item_data['amount'])
                 
                 # Generate subscription orders if applicable
                 if self.sub_var.get() > 0:
@@ -1938,7 +1972,9 @@ class ProductionApp(tk.Tk):
             
             messagebox.showinfo("Erfolg", "Bestellung erfolgreich gespeichert!")
             self.clear_form()
-            print("[DEBUG] UI refresh triggered")
+            if hasattr(self, 'delivery_view'):
+                self.delivery_view.invalidate_cache()
+            logger.debug("UI refresh triggered")
             self.refresh_tables()
             
         except Exception as e:
@@ -1975,6 +2011,7 @@ class ProductionApp(tk.Tk):
         def delivery_on_edit_order(order_data, new_data):
             # This will be called when an order is edited in the delivery tab
             print("Order edited in delivery tab, recording for undo")
+            self.delivery_view.invalidate_cache()
             self.record_action(
                 ACTION_EDIT_ORDER,
                 order_data,  # Original order data
@@ -2091,6 +2128,7 @@ class ProductionApp(tk.Tk):
         self.after(300, refresh_other_tabs)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
     check_for_updates()
     app = ProductionApp()
     app.mainloop()
\ No newline at end of file
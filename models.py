@@ -7,6 +7,16 @@ from datetime import datetime, timedelta
 
 db = SqliteDatabase('production.db')
 
+# Subscription types by Order.subscription_type, and the set of their labels
+SUBSCRIPTION_TYPES = {
+    0: "Kein Abonnement",
+    1: "Wöchentlich",
+    2: "Zweiwöchentlich",
+    3: "Alle 3 Wochen",
+    4: "Alle 4 Wochen"
+}
+SUBSCRIPTION_LABELS = frozenset(SUBSCRIPTION_TYPES.values())
+
 class BaseModel(Model):
     class Meta:
         database = db
@@ -39,6 +49,14 @@ class Order(BaseModel):
     is_future = BooleanField(default=False)
     created_at = DateTimeField(default=datetime.now)
     
+    class Meta:
+        indexes = (
+            # The orders of one subscription, by delivery date
+            (('customer', 'from_date', 'to_date', 'subscription_type', 'delivery_date'), False),
+            # The orders of a customer from a date on, e.g. on one weekday
+            (('customer', 'delivery_date'), False),
+        )
+    
     @property
     def total_price(self):
         return sum(item.total_price for item in self.order_items)
@@ -64,5 +82,6 @@ class OrderItem(BaseModel):
         return self.amount * self.item.price
 
 def create_tables():
+    """Create the tables and indexes that do not exist yet"""
     with db:
         db.create_tables([Customer, Item, Order, OrderItem])
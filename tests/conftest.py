@@ -3,10 +3,13 @@ import os
 import sys
 from datetime import datetime, timedelta, date
 import uuid
+from unittest.mock import MagicMock, patch
 
 # Add parent directory to path so we can import app modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from peewee import SqliteDatabase
+
 from models import db, Customer, Item, Order, OrderItem
 
 # Helper function for date handling in tests
@@ -28,11 +31,41 @@ def normalize_date(date_value):
             raise ValueError(f"Error converting date string {date_value}: {e}")
     raise TypeError(f"Expected date or string, got {type(date_value)}")
 
-@pytest.fixture
-def test_db():
-    """Create an in-memory database for testing"""
-    # Use in-memory SQLite database
-    db.init(':memory:')
+def make_order(**fields):
+    """Insert an order with the usual defaults (a non-subscription future
+    order) and return it without reading it back from the database.
+    Extra attributes such as production_date are kept on the returned
+    instance but not written."""
+    row = {
+        'from_date': None,
+        'to_date': None,
+        'subscription_type': 0,
+        'halbe_channel': False,
+        'order_id': uuid.uuid4(),
+        'is_future': True,
+        **fields
+    }
+    order_id = Order.insert({k: v for k, v in row.items() if k in Order._meta.fields}).execute()
+    return Order(id=order_id, **row)
+
+@pytest.fixture(scope="session")
+def today():
+    """The current date, evaluated once so all tests and the sample data
+    agree on it (and can be frozen in one place)"""
+    return datetime.now().date()
+
+@pytest.fixture(scope="session")
+def _session_db():
+    """Create an in-memory database shared by all tests of the session"""
+    # Use in-memory SQLite database; enforce foreign keys so deleting an
+    # Order cascades to its OrderItems (on_delete='CASCADE' in models.py).
+    # The database is throwaway, so skip journaling to disk and syncing.
+    db.init(':memory:', pragmas={
+        'foreign_keys': 1,
+        'journal_mode': 'memory',
+        'synchronous': 0,
+        'temp_store': 'memory',
+    })
     db.connect()
     db.create_tables([Customer, Item, Order, OrderItem])
     
@@ -49,8 +82,34 @@ def test_db():
             db.close()
 
 @pytest.fixture
-def sample_data(test_db):
-    """Create sample data for testing"""
+def test_db(_session_db):
+    """Run each test in a transaction that is rolled back afterwards,
+    so every test sees the same database state without re-creating it"""
+    with _session_db.atomic() as txn:
+        yield _session_db
+        txn.rollback()
+
+@pytest.fixture
+def private_db(monkeypatch):
+    """A fresh in-memory database of its own for one test, not wrapped in
+    a transaction like test_db. For code that behaves differently inside
+    a transaction, such as the transfer schedule cache; nothing written
+    here reaches the shared session database."""
+    import database
+    models = [Customer, Item, Order, OrderItem]
+    private = SqliteDatabase(':memory:', pragmas={'foreign_keys': 1})
+    # database.py queries through its own reference to the database
+    monkeypatch.setattr(database, 'db', private)
+    monkeypatch.setattr(database, '_transfer_schedule_cache', {})
+    monkeypatch.setattr(database, '_transfer_schedule_version', None)
+    with private.bind_ctx(models):
+        private.create_tables(models)
+        yield private
+    private.close()
+
+@pytest.fixture(scope="session")
+def _session_sample_data(_session_db, today):
+    """Create sample data once per session and return the ids of the rows"""
     # Create customers
     customers = [
         Customer.create(name="Test Customer 1"),
@@ -66,7 +125,6 @@ def sample_data(test_db):
     ]
     
     # Create orders
-    today = datetime.now().date()
     orders = [
         # Regular order
         Order.create(
@@ -96,14 +154,44 @@ def sample_data(test_db):
     
     # Create order items
     order_items = [
-        OrderItem.create(order=orders[0], item=items[0], amount=2.5),
-        OrderItem.create(order=orders[0], item=items[1], amount=1.5),
-        OrderItem.create(order=orders[1], item=items[0], amount=3.0)
+        OrderItem.create(order=orders[0], item=items[0], amount=2.5, production_date=today),
+        OrderItem.create(order=orders[0], item=items[1], amount=1.5, production_date=today),
+        OrderItem.create(order=orders[1], item=items[0], amount=3.0, production_date=today)
     ]
     
     return {
-        'customers': customers,
-        'items': items,
-        'orders': orders,
-        'order_items': order_items
-    } 
\ No newline at end of file
+        'customers': [c.id for c in customers],
+        'items': [i.id for i in items],
+        'orders': [o.id for o in orders],
+        'order_items': [oi.id for oi in order_items]
+    }
+
+@pytest.fixture
+def sample_data(test_db, _session_sample_data):
+    """Sample data for testing, as fresh instances for every test"""
+    # Re-read the rows so changes a previous test made to the instances
+    # (and that were rolled back in the database) do not leak
+    models = {'customers': Customer, 'items': Item, 'orders': Order, 'order_items': OrderItem}
+    return {
+        key: list(model.select().where(model.id.in_(_session_sample_data[key])).order_by(model.id))
+        for key, model in models.items()
+    }
+
+@pytest.fixture(scope="session")
+def production_app_cls():
+    """Import ProductionApp once per session, with ttkbootstrap and the
+    weekly views mocked to avoid initialization issues"""
+    mock_ttkbootstrap = MagicMock()
+    mock_api = MagicMock()
+    mock_api.ttk = MagicMock()
+    mock_ttkbootstrap.Style = MagicMock()
+    
+    # Apply mocks before importing from main
+    with patch.dict(sys.modules, {'ttkbootstrap': mock_ttkbootstrap, 'ttkbootstrap.api': mock_api}):
+        # Patch WeeklyDeliveryView, WeeklyProductionView, WeeklyTransferView before importing ProductionApp
+        with patch('weekly_view.WeeklyDeliveryView'), \
+             patch('weekly_view.WeeklyProductionView'), \
+             patch('weekly_view.WeeklyTransferView'):
+            from main import ProductionApp
+        
+        yield ProductionApp
@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 import uuid
 from models import Customer, Item, Order, OrderItem
 from database import calculate_production_date, generate_subscription_orders, get_delivery_schedule
-from database import get_production_plan, get_transfer_schedule
+from database import get_production_plan, get_transfer_schedule, on_weekday
+from unittest.mock import patch
 
 
 def test_calculate_production_date(test_db, sample_data):
@@ -258,6 +259,30 @@ def test_order_delete_with_future(test_db, sample_data):
             Order.get(Order.id == order_id)
 
 
+def test_on_weekday(test_db, sample_data):
+    """Test that the weekday condition matches date.weekday() for every day of a week"""
+    customer = sample_data['customers'][0]
+    today = datetime.now().date()
+    
+    orders = [
+        Order.create(
+            customer=customer,
+            delivery_date=today + timedelta(days=30 + i),
+            production_date=today,
+            order_id=uuid.uuid4()
+        )
+        for i in range(7)
+    ]
+    
+    for order in orders:
+        weekday = order.delivery_date.weekday()
+        matching = Order.select().where(
+            (Order.id.in_([o.id for o in orders])) &
+            on_weekday(Order.delivery_date, weekday)
+        )
+        assert [o.id for o in matching] == [order.id]
+
+
 def test_get_delivery_schedule(test_db, sample_data):
     """Test retrieving the delivery schedule for a specific time period"""
     today = datetime.now().date()
@@ -332,4 +357,36 @@ def test_get_transfer_schedule(test_db, sample_data):
             found_transfer = True
             break
     
-    assert found_transfer, "Expected transfer not found in schedule" 
\ No newline at end of file
+    assert found_transfer, "Expected transfer not found in schedule" 
+
+
+def test_get_transfer_schedule_cache(private_db, today):
+    """The transfer schedule is served from the cache until the data changes.
+
+    The cache is bypassed inside a transaction, so this test uses a database
+    of its own (private_db) instead of the rolled-back test_db.
+    """
+    customer = Customer.create(name="Cache Customer")
+    item = Item.create(name="Cache Item", growth_days=3, soaking_days=1, germination_days=2,
+                       price=5.0, seed_quantity=0.1)
+    order = Order.create(customer=customer, delivery_date=today + timedelta(days=7),
+                         order_id=uuid.uuid4())
+    
+    start_date = today
+    end_date = today + timedelta(days=6)
+    transfer_date = today + timedelta(days=item.soaking_days + item.germination_days)
+    
+    OrderItem.create(order=order, item=item, amount=2.0,
+                     production_date=today, transfer_date=transfer_date)
+    transfers = get_transfer_schedule(start_date, end_date)
+    assert transfers == [{'date': transfer_date, 'item': item.name, 'amount': 2.0}]
+    
+    # Nothing changed: the second call must not query the database
+    with patch.object(OrderItem, 'select', side_effect=AssertionError("cache miss")):
+        assert get_transfer_schedule(start_date, end_date) == transfers
+    
+    # A write invalidates the cache
+    OrderItem.create(order=order, item=item, amount=1.5,
+                     production_date=today, transfer_date=transfer_date)
+    transfers = get_transfer_schedule(start_date, end_date)
+    assert transfers == [{'date': transfer_date, 'item': item.name, 'amount': 3.5}]
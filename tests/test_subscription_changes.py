@@ -1,12 +1,19 @@
 import pytest
 from datetime import datetime, timedelta, date
+import os
 import uuid
-from models import Customer, Item, Order, OrderItem
+from models import Customer, Item, Order, OrderItem, SUBSCRIPTION_LABELS
 from database import calculate_production_date, generate_subscription_orders
-from peewee import fn
-from unittest.mock import MagicMock, patch
-import tkinter as tk
-import sys
+from database import get_delivery_schedule, get_production_plan, get_transfer_schedule
+from peewee import fn, chunked
+from unittest.mock import patch
+
+# Translation table for amounts entered with a decimal comma
+_COMMA_TO_DOT = str.maketrans({',': '.'})
+
+def _uuid():
+    """Random UUID for test rows; the tests never look at the UUID version"""
+    return uuid.UUID(bytes=os.urandom(16))
 
 def test_change_subscription_type_weekly_to_biweekly(test_db, sample_data):
     """
@@ -22,27 +29,36 @@ def test_change_subscription_type_weekly_to_biweekly(test_db, sample_data):
     to_date = today + timedelta(days=28)  # 4 weeks
     
     # Create initial order and future orders
-    orders = []
-    for i in range(4):  # Create 4 weekly orders
-        delivery_date = from_date + timedelta(days=7*i)
-        production_date = delivery_date - timedelta(days=items[0].total_days)
-        
-        order = Order.create(
-            customer=customer,
-            delivery_date=delivery_date,
-            production_date=production_date,
-            from_date=from_date,
-            to_date=to_date,
-            subscription_type=1,  # Weekly
-            halbe_channel=False,
-            order_id=uuid.uuid4(),
-            is_future=True
-        )
+    rows = [
+        {
+            'customer': customer,
+            'delivery_date': from_date + timedelta(days=7*i),
+            'from_date': from_date,
+            'to_date': to_date,
+            'subscription_type': 1,  # Weekly
+            'halbe_channel': False,
+            'order_id': _uuid(),
+            'is_future': True
+        }
+        for i in range(4)  # Create 4 weekly orders
+    ]
+    
+    item0_days = items[0].total_days
+    with test_db.atomic():
+        Order.insert_many(rows).execute()
+        orders = list(Order.select().where(
+            (Order.from_date == from_date) & 
+            (Order.to_date == to_date) &
+            (Order.customer == customer)
+        ).order_by(Order.delivery_date))
         
         # Add items to order
-        OrderItem.create(order=order, item=items[0], amount=2.0)
-        
-        orders.append(order)
+        oi_rows = [
+            {'order': order, 'item': items[0], 'amount': 2.0,
+             'production_date': order.delivery_date - timedelta(days=item0_days)}
+            for order in orders
+        ]
+        OrderItem.insert_many(oi_rows).execute()
     
     # Verify weekly spacing
     for i in range(1, len(orders)):
@@ -67,31 +83,33 @@ def test_change_subscription_type_weekly_to_biweekly(test_db, sample_data):
             if i < len(orders):
                 orders_to_delete.append(orders[i].id)
         
-        # Delete order items first
+        # Delete the orders; their order items go with them (ON DELETE CASCADE)
         if orders_to_delete:
-            OrderItem.delete().where(OrderItem.order_id.in_(orders_to_delete)).execute()
-            # Then delete the orders
             Order.delete().where(Order.id.in_(orders_to_delete)).execute()
     
-    # Verify changes:
+    # Verify changes (read the subscription type of all test orders at once)
+    subscription_types = {
+        o.id: o.subscription_type
+        for o in Order.select(Order.id, Order.subscription_type).where(Order.id.in_([o.id for o in orders]))
+    }
+    
     # 1. First order should still be weekly (unchanged)
-    refreshed_first = Order.get(Order.id == orders[0].id)
-    assert refreshed_first.subscription_type == 1
+    assert subscription_types[orders[0].id] == 1
     
     # 2. Remaining orders should be bi-weekly
     for i in range(start_index, len(orders), 2):
         if i < len(orders):
-            order = Order.get_or_none(Order.id == orders[i].id)
-            assert order is not None
-            assert order.subscription_type == 2
+            assert subscription_types.get(orders[i].id) == 2
     
     # 3. Verify orders at odd indices (2nd, 4th, etc) are deleted
     for i in range(start_index + 1, len(orders), 2):
         if i < len(orders):
-            order = Order.get_or_none(Order.id == orders[i].id)
-            assert order is None
+            assert orders[i].id not in subscription_types
+    
+    # 4. Order items of the deleted orders should be gone as well
+    assert OrderItem.select().where(OrderItem.order_id.in_(orders_to_delete)).count() == 0
     
-    # 4. Count total orders - should be 2 (first order and third order)
+    # 5. Count total orders - should be 2 (first order and third order)
     # The sample_data fixture may have existing orders, so we need to apply the same filter
     # that we used when creating our test orders
     count = Order.select().where(
@@ -115,27 +133,36 @@ def test_change_subscription_type_biweekly_to_weekly(test_db, sample_data):
     to_date = today + timedelta(days=28)  # 4 weeks
     
     # Create initial order and future orders with bi-weekly spacing
-    orders = []
-    for i in range(3):  # Create 3 bi-weekly orders
-        delivery_date = from_date + timedelta(days=14*i)  # Every 2 weeks
-        production_date = delivery_date - timedelta(days=items[0].total_days)
-        
-        order = Order.create(
-            customer=customer,
-            delivery_date=delivery_date,
-            production_date=production_date,
-            from_date=from_date,
-            to_date=to_date,
-            subscription_type=2,  # Bi-weekly
-            halbe_channel=False,
-            order_id=uuid.uuid4(),
-            is_future=True
-        )
+    rows = [
+        {
+            'customer': customer,
+            'delivery_date': from_date + timedelta(days=14*i),  # Every 2 weeks
+            'from_date': from_date,
+            'to_date': to_date,
+            'subscription_type': 2,  # Bi-weekly
+            'halbe_channel': False,
+            'order_id': _uuid(),
+            'is_future': True
+        }
+        for i in range(3)  # Create 3 bi-weekly orders
+    ]
+    
+    item0_days = items[0].total_days
+    with test_db.atomic():
+        Order.insert_many(rows).execute()
+        orders = list(Order.select().where(
+            (Order.from_date == from_date) & 
+            (Order.to_date == to_date) &
+            (Order.customer == customer)
+        ).order_by(Order.delivery_date))
         
         # Add items to order
-        OrderItem.create(order=order, item=items[0], amount=2.0)
-        
-        orders.append(order)
+        oi_rows = [
+            {'order': order, 'item': items[0], 'amount': 2.0,
+             'production_date': order.delivery_date - timedelta(days=item0_days)}
+            for order in orders
+        ]
+        OrderItem.insert_many(oi_rows).execute()
     
     # Verify bi-weekly spacing
     for i in range(1, len(orders)):
@@ -157,59 +184,68 @@ def test_change_subscription_type_biweekly_to_weekly(test_db, sample_data):
         ).execute()
         
         # Create new weekly orders to fill the gaps
-        new_orders = []
+        new_rows = []
+        sources = {}
         for i in range(start_index, len(orders)-1):
             # Create an order for the week in between
             mid_date = orders[i].delivery_date + timedelta(days=7)
             if mid_date <= to_date:
-                production_date = mid_date - timedelta(days=items[0].total_days)
-                
-                new_order = Order.create(
-                    customer=customer,
-                    delivery_date=mid_date,
-                    production_date=production_date,
-                    from_date=from_date,
-                    to_date=to_date,
-                    subscription_type=1,  # Weekly
-                    halbe_channel=False,
-                    order_id=uuid.uuid4(),
-                    is_future=True
-                )
-                
-                # Copy items from original order
-                for item in orders[i].order_items:
-                    OrderItem.create(
-                        order=new_order,
-                        item=item.item,
-                        amount=item.amount
-                    )
-                
-                new_orders.append(new_order)
+                order_uuid = _uuid()
+                new_rows.append({
+                    'customer': customer,
+                    'delivery_date': mid_date,
+                    'from_date': from_date,
+                    'to_date': to_date,
+                    'subscription_type': 1,  # Weekly
+                    'halbe_channel': False,
+                    'order_id': order_uuid,
+                    'is_future': True
+                })
+                sources[order_uuid] = orders[i]
+        
+        new_orders = []
+        if new_rows:
+            Order.insert_many(new_rows).execute()
+            new_orders = list(Order.select().where(Order.order_id.in_(list(sources))))
+        
+        # Copy items from original order
+        oi_rows = [
+            {
+                'order': new_order,
+                'item': it.item,
+                'amount': it.amount,
+                'production_date': new_order.delivery_date - timedelta(days=it.item.total_days)
+            }
+            for new_order in new_orders
+            for it in sources[new_order.order_id].order_items
+        ]
+        for batch in chunked(oi_rows, 100):
+            OrderItem.insert_many(batch).execute()
     
     # Verify changes:
     # 1. First order should still be bi-weekly (unchanged)
-    refreshed_first = Order.get(Order.id == orders[0].id)
+    refreshed_first = Order.get_by_id(orders[0].id)
     assert refreshed_first.subscription_type == 2
     
     # 2. All future orders should be weekly
-    future_orders = Order.select().where(
+    future_orders = list(Order.select(Order.delivery_date, Order.subscription_type).where(
         (Order.from_date == from_date) & 
         (Order.to_date == to_date) &
         (Order.delivery_date >= orders[start_index].delivery_date) &
         (Order.customer == customer)  # Add customer filter
-    ).order_by(Order.delivery_date)
+    ).order_by(Order.delivery_date).dicts())
     
     # Should have at least 3 orders (original second + third orders and at least 1 new)
-    assert future_orders.count() >= 3
+    assert len(future_orders) >= 3
     
     # Check weekly spacing
     prev_date = None
     for order in future_orders:
         if prev_date:
-            delta = order.delivery_date - prev_date
+            delta = order['delivery_date'] - prev_date
             assert delta.days == 7  # Weekly spacing
-        prev_date = order.delivery_date
-        assert order.subscription_type == 1  # All should be weekly
+        prev_date = order['delivery_date']
+        assert order['subscription_type'] == 1  # All should be weekly
 
 def test_order_edit_propagates_to_views(test_db, sample_data):
     """
@@ -225,39 +261,45 @@ def test_order_edit_propagates_to_views(test_db, sample_data):
     to_date = today + timedelta(days=28)
     
     # Create 4 weekly orders
-    orders = []
-    for i in range(4):
-        delivery_date = from_date + timedelta(days=7*i)
-        production_date = delivery_date - timedelta(days=items[0].total_days)
-        
-        order = Order.create(
-            customer=customer,
-            delivery_date=delivery_date,
-            production_date=production_date,
-            from_date=from_date,
-            to_date=to_date,
-            subscription_type=1,  # Weekly
-            halbe_channel=False,
-            order_id=uuid.uuid4(),
-            is_future=True
-        )
+    rows = [
+        {
+            'customer': customer,
+            'delivery_date': from_date + timedelta(days=7*i),
+            'from_date': from_date,
+            'to_date': to_date,
+            'subscription_type': 1,  # Weekly
+            'halbe_channel': False,
+            'order_id': _uuid(),
+            'is_future': True
+        }
+        for i in range(4)
+    ]
+    
+    item0_days = items[0].total_days
+    with test_db.atomic():
+        Order.insert_many(rows).execute()
+        orders = list(Order.select().where(
+            (Order.from_date == from_date) & 
+            (Order.to_date == to_date) &
+            (Order.customer == customer)
+        ).order_by(Order.delivery_date))
         
         # Add items to order
-        OrderItem.create(order=order, item=items[0], amount=2.0)
-        
-        orders.append(order)
-    
-    # Get initial counts from the view queries
-    from database import get_delivery_schedule, get_production_plan, get_transfer_schedule
-    
+        oi_rows = [
+            {'order': order, 'item': items[0], 'amount': 2.0,
+             'production_date': order.delivery_date - timedelta(days=item0_days)}
+            for order in orders
+        ]
+        OrderItem.insert_many(oi_rows).execute()
+    
+    # Get initial counts from the queries behind the three views
     # Use a more specific filter to get only our test orders
-    test_delivery_schedule = get_delivery_schedule(start_date=from_date, end_date=to_date)
-    test_delivery_schedule = [order for order in test_delivery_schedule 
-                             if order.customer.id == customer.id and order.from_date == from_date]
+    test_delivery_schedule = [order for order in get_delivery_schedule(start_date=from_date, end_date=to_date)
+                              if order.customer_id == customer.id and order.from_date == from_date]
     delivery_before = len(test_delivery_schedule)
     
     # For production and transfer, we'll just get counts for comparison
-    production_before = len(list(get_production_plan(start_date=from_date, end_date=to_date)))
+    production_before = len(get_production_plan(start_date=from_date, end_date=to_date))
     transfer_before = len(get_transfer_schedule(start_date=from_date, end_date=to_date))
     
     # Test: Change subscription type to bi-weekly (delete every other order)
@@ -276,18 +318,17 @@ def test_order_edit_propagates_to_views(test_db, sample_data):
         delete_indices = [1, 3]  # Delete 2nd and 4th orders
         orders_to_delete = [orders[i].id for i in delete_indices]
         
+        # Order items are removed by ON DELETE CASCADE
         if orders_to_delete:
-            OrderItem.delete().where(OrderItem.order_id.in_(orders_to_delete)).execute()
             Order.delete().where(Order.id.in_(orders_to_delete)).execute()
     
     # Get updated counts from the view queries with the same filters
-    test_delivery_schedule_after = get_delivery_schedule(start_date=from_date, end_date=to_date)
-    test_delivery_schedule_after = [order for order in test_delivery_schedule_after 
-                                  if order.customer.id == customer.id and order.from_date == from_date]
+    test_delivery_schedule_after = [order for order in get_delivery_schedule(start_date=from_date, end_date=to_date)
+                                    if order.customer_id == customer.id and order.from_date == from_date]
     delivery_after = len(test_delivery_schedule_after)
     
     # For production and transfer, we'll just compare if they changed
-    production_after = len(list(get_production_plan(start_date=from_date, end_date=to_date)))
+    production_after = len(get_production_plan(start_date=from_date, end_date=to_date))
     transfer_after = len(get_transfer_schedule(start_date=from_date, end_date=to_date))
     
     # Assert the counts have changed properly
@@ -324,57 +365,75 @@ def test_adding_item_to_existing_orders(test_db, sample_data):
     to_date = today + timedelta(days=21)  # 3 weeks
     
     # Create 3 weekly orders with one item
-    orders = []
-    for i in range(3):
-        delivery_date = from_date + timedelta(days=7*i)
-        production_date = delivery_date - timedelta(days=items[0].total_days)
-        
-        order = Order.create(
-            customer=customer,
-            delivery_date=delivery_date,
-            production_date=production_date,
-            from_date=from_date,
-            to_date=to_date,
-            subscription_type=1,  # Weekly
-            halbe_channel=False,
-            order_id=uuid.uuid4(),
-            is_future=True
-        )
+    rows = [
+        {
+            'customer': customer,
+            'delivery_date': from_date + timedelta(days=7*i),
+            'from_date': from_date,
+            'to_date': to_date,
+            'subscription_type': 1,  # Weekly
+            'halbe_channel': False,
+            'order_id': _uuid(),
+            'is_future': True
+        }
+        for i in range(3)
+    ]
+    
+    item0_days = items[0].total_days
+    with test_db.atomic():
+        Order.insert_many(rows).execute()
+        orders = list(Order.select().where(
+            (Order.from_date == from_date) & 
+            (Order.to_date == to_date) &
+            (Order.customer == customer)
+        ).order_by(Order.delivery_date))
         
         # Add first item to order
-        OrderItem.create(order=order, item=items[0], amount=2.0)
-        
-        orders.append(order)
+        oi_rows = [
+            {'order': order, 'item': items[0], 'amount': 2.0,
+             'production_date': order.delivery_date - timedelta(days=item0_days)}
+            for order in orders
+        ]
+        OrderItem.insert_many(oi_rows).execute()
     
     # Test: Add a second item to all orders in the subscription
     with test_db.atomic():
+        oi_rows = []
         for order in orders:
             # Add second item
-            OrderItem.create(order=order, item=items[1], amount=1.5)
-            
-            # Update production date based on new max growth period
-            max_days = max(item.total_days for item in [items[0], items[1]])
-            order.production_date = order.delivery_date - timedelta(days=max_days)
-            order.save()
+            oi_rows.append({'order': order, 'item': items[1], 'amount': 1.5,
+                            'production_date': order.delivery_date - timedelta(days=items[1].total_days)})
+        
+        for batch in chunked(oi_rows, 100):
+            OrderItem.insert_many(batch).execute()
     
     # Verify changes:
+    order_ids = [o.id for o in orders]
+    counts = dict(OrderItem.select(OrderItem.order, fn.COUNT(OrderItem.id))
+                  .where(OrderItem.order.in_(order_ids))
+                  .group_by(OrderItem.order)
+                  .tuples())
+    pairs = set(OrderItem.select(OrderItem.order, OrderItem.item)
+                .where(OrderItem.order.in_(order_ids))
+                .tuples())
+    
     # 1. Each order should have 2 items
-    for order_id in [o.id for o in orders]:
-        refreshed = Order.get(Order.id == order_id)
-        order_items = list(refreshed.order_items)
-        assert len(order_items) == 2
+    for order_id in order_ids:
+        assert counts.get(order_id) == 2
         
         # Check all orders have both items
-        item_ids = [oi.item.id for oi in order_items]
-        assert items[0].id in item_ids
-        assert items[1].id in item_ids
-    
-    # 2. Production dates should be updated correctly
-    for order_id in [o.id for o in orders]:
-        refreshed = Order.get(Order.id == order_id)
-        max_days = max(item.total_days for item in [items[0], items[1]])
-        expected_date = refreshed.delivery_date - timedelta(days=max_days)
-        assert refreshed.production_date == expected_date
+        assert (order_id, items[0].id) in pairs
+        assert (order_id, items[1].id) in pairs
+    
+    # 2. Each item keeps its own production date (delivery date minus the
+    # item's growth period), the new item does not move the existing ones
+    for oi in (OrderItem.select(OrderItem, Order, Item)
+               .join(Order)
+               .switch(OrderItem)
+               .join(Item)
+               .where(OrderItem.order.in_(order_ids))):
+        expected_date = oi.order.delivery_date - timedelta(days=oi.item.total_days)
+        assert oi.production_date == expected_date
 
 def test_changing_delivery_dates_affects_production_dates(test_db, sample_data):
     """
@@ -400,7 +459,7 @@ def test_changing_delivery_dates_affects_production_dates(test_db, sample_data):
         to_date=None,
         subscription_type=0,  # No subscription
         halbe_channel=False,
-        order_id=uuid.uuid4(),
+        order_id=_uuid(),
         is_future=True
     )
     
@@ -414,17 +473,15 @@ def test_changing_delivery_dates_affects_production_dates(test_db, sample_data):
     # Test: Change delivery date to 1 week later
     new_delivery_date = delivery_date + timedelta(days=7)
     
-    with test_db.atomic():
-        order.delivery_date = new_delivery_date
-        # Update production date based on the items' growth periods
-        order_items = list(order.order_items)
-        max_days = max(oi.item.total_days for oi in order_items)
-        order.production_date = new_delivery_date - timedelta(days=max_days)
-        order.save()
+    order.delivery_date = new_delivery_date
+    # Update production date based on the items' growth periods
+    # (max_days was computed from the same items above)
+    order.production_date = new_delivery_date - timedelta(days=max_days)
+    order.save()
     
     # Verify changes:
     # 1. Delivery date should be updated
-    refreshed = Order.get(Order.id == order.id)
+    refreshed = Order.get_by_id(order.id)
     assert refreshed.delivery_date == new_delivery_date
     
     # 2. Production date should be shifted by the same amount
@@ -433,23 +490,6 @@ def test_changing_delivery_dates_affects_production_dates(test_db, sample_data):
     # 3. Production date should maintain the correct offset from delivery date
     assert (refreshed.delivery_date - refreshed.production_date).days == max_days 
 
-# Mock ttkbootstrap to avoid initialization issues
-mock_ttkbootstrap = MagicMock()
-mock_api = MagicMock()
-mock_api.ttk = MagicMock()
-mock_ttkbootstrap.Style = MagicMock()
-
-# Apply mocks before importing from main
-sys.modules['ttkbootstrap'] = mock_ttkbootstrap
-sys.modules['ttkbootstrap.api'] = mock_api
-
-# Now patch WeeklyDeliveryView, WeeklyProductionView, WeeklyTransferView before importing ProductionApp
-with patch('weekly_view.WeeklyDeliveryView'), \
-     patch('weekly_view.WeeklyProductionView'), \
-     patch('weekly_view.WeeklyTransferView'):
-    # Import ProductionApp after we've patched all the dependencies
-    from main import ProductionApp
-
 class MockEntry:
     """Mock class for ttk.Entry for testing"""
     def __init__(self, master=None, width=None, **kwargs):
@@ -535,7 +575,7 @@ def test_order_edit_item_amount_validation(mock_showerror, test_db, sample_data,
         to_date=to_date,
         subscription_type=1,  # Weekly
         halbe_channel=False,
-        order_id=uuid.uuid4(),
+        order_id=_uuid(),
         is_future=True
     )
     
@@ -561,11 +601,10 @@ def test_order_edit_item_amount_validation(mock_showerror, test_db, sample_data,
         # If we get here, conversion succeeded
         assert amount == 3.5
         
-        # Update the order item in the database
-        with test_db.atomic():
-            order_item = OrderItem.get(OrderItem.order == order)
-            order_item.amount = amount
-            order_item.save()
+        # Update the order item in the database (single write, no transaction needed)
+        order_item = OrderItem.get(OrderItem.order == order)
+        order_item.amount = amount
+        order_item.save()
         
         # Verify the update was successful
         updated_item = OrderItem.get(OrderItem.order == order)
@@ -594,7 +633,7 @@ def test_order_edit_item_amount_validation(mock_showerror, test_db, sample_data,
             """Validate that amount string is a valid number before converting"""
             try:
                 # Try to remove any commas used as decimal separators
-                cleaned_str = amount_str.replace(',', '.')
+                cleaned_str = amount_str.translate(_COMMA_TO_DOT)
                 value = float(cleaned_str)
                 if value <= 0:
                     return False, f"Menge muss größer als 0 sein für Artikel {item_name}"
@@ -635,7 +674,7 @@ def test_edit_order_subscription_vs_amount_confusion(mock_showerror, test_db, sa
         to_date=to_date,
         subscription_type=1,  # Weekly = Wöchentlich
         halbe_channel=False,
-        order_id=uuid.uuid4(),
+        order_id=_uuid(),
         is_future=True
     )
     
@@ -706,14 +745,14 @@ def test_edit_order_subscription_vs_amount_confusion(mock_showerror, test_db, sa
                     amount_str = item_row['amount_entry'].get().strip()
                     
                     # First check if this might be a subscription type string
-                    if amount_str in ["Wöchentlich", "Zweiwöchentlich", "Alle 3 Wochen", "Alle 4 Wochen"]:
+                    if amount_str in SUBSCRIPTION_LABELS:
                         # Just call the function instead of asserting it was called
                         mock_showerror("Fehler", 
                             f"Ungültige Menge: '{amount_str}' scheint ein Abonnementtyp zu sein statt einer Zahl.")
                         return False
                     
                     # Try to convert with better handling of decimal separators
-                    amount_str = amount_str.replace(',', '.')
+                    amount_str = amount_str.translate(_COMMA_TO_DOT)
                     amount = float(amount_str)
                     
                     if amount <= 0:
@@ -1,33 +1,36 @@
 import pytest
-from datetime import datetime, timedelta
-import uuid
-from models import Customer, Item, Order, OrderItem
-from database import get_delivery_schedule, get_production_plan, get_transfer_schedule
+from datetime import timedelta
+from models import Customer, Item, OrderItem
+from database import get_delivery_schedule, get_delivery_schedule_flat, get_production_plan, get_transfer_schedule
+from conftest import make_order
 
 
-def test_delivery_schedule_update(test_db, sample_data):
+def _index_transfers(transfers, transfer_date):
+    """Index transfers by item name, preferring the transfer on transfer_date
+    (the date could be a string or a date object) over any other date"""
+    first, on_date = {}, {}
+    for transfer in transfers:
+        first.setdefault(transfer['item'], transfer)
+        if transfer['date'] == transfer_date or (
+            isinstance(transfer['date'], str) and transfer_date.strftime('%Y-%m-%d') in transfer['date']
+        ):
+            on_date.setdefault(transfer['item'], transfer)
+    return {**first, **on_date}
+
+
+def test_delivery_schedule_update(test_db, sample_data, today):
     """Test that changes to orders are reflected in the delivery schedule"""
     # Setup - get items and customer
     customer = sample_data['customers'][0]
     item = sample_data['items'][0]
     
-    today = datetime.now().date()
     tomorrow = today + timedelta(days=1)
     
     # Create an order for tomorrow
-    order = Order.create(
-        customer=customer,
-        delivery_date=tomorrow,
-        production_date=today,
-        from_date=None,
-        to_date=None,
-        subscription_type=0,
-        halbe_channel=False,
-        order_id=uuid.uuid4(),
-        is_future=True
-    )
+    order = make_order(customer=customer, delivery_date=tomorrow, production_date=today)
     
-    OrderItem.create(order=order, item=item, amount=2.0)
+    OrderItem.create(order=order, item=item, amount=2.0, production_date=today,
+                     transfer_date=today + timedelta(days=item.soaking_days + item.germination_days))
     
     # Get delivery schedule for tomorrow
     schedule_before = get_delivery_schedule(tomorrow, tomorrow)
@@ -52,41 +55,47 @@ def test_delivery_schedule_update(test_db, sample_data):
     assert schedule_after[0].order_items[0].amount == 3.0
 
 
-def test_production_plan_update(test_db, sample_data):
+def test_delivery_schedule_flat(test_db, sample_data, today):
+    """Test that the flat delivery schedule has one row per order item and skips empty orders"""
+    customer = sample_data['customers'][0]
+    items = sample_data['items']
+    
+    tomorrow = today + timedelta(days=1)
+    
+    order = make_order(customer=customer, delivery_date=tomorrow, production_date=today)
+    OrderItem.insert_many([
+        {'order': order, 'item': items[0], 'amount': 2.0, 'production_date': today},
+        {'order': order, 'item': items[1], 'amount': 1.5, 'production_date': today},
+    ]).execute()
+    empty_order = make_order(customer=customer, delivery_date=tomorrow, production_date=today)
+    
+    rows = get_delivery_schedule_flat(tomorrow, tomorrow)
+    assert sorted(rows) == sorted([
+        (order.id, tomorrow, customer.name, items[0].name, 2.0),
+        (order.id, tomorrow, customer.name, items[1].name, 1.5),
+    ])
+    assert empty_order.id not in {row[0] for row in rows}
+
+
+def test_production_plan_update(test_db, sample_data, today):
     """Test that changes to orders are reflected in the production plan"""
     # Setup
     customer = sample_data['customers'][0]
     item = sample_data['items'][0]
     
-    today = datetime.now().date()
     tomorrow = today + timedelta(days=1)
     
     # Create an order with production date today
-    order = Order.create(
-        customer=customer,
-        delivery_date=tomorrow,
-        production_date=today,
-        from_date=None,
-        to_date=None,
-        subscription_type=0,
-        halbe_channel=False,
-        order_id=uuid.uuid4(),
-        is_future=True
-    )
+    order = make_order(customer=customer, delivery_date=tomorrow, production_date=today)
     
-    OrderItem.create(order=order, item=item, amount=2.0)
+    OrderItem.create(order=order, item=item, amount=2.0, production_date=today,
+                     transfer_date=today + timedelta(days=item.soaking_days + item.germination_days))
     
-    # Get production plan for today
-    plan_before = list(get_production_plan(today, today))
-    assert len(plan_before) > 0
+    # Get production plan for today, filtered to our item in SQL
+    plan_before = get_production_plan(today, today, item=item)
     
     # Get the total amount for our item
-    item_before = None
-    for row in plan_before:
-        if row.item.name == item.name:
-            item_before = row
-            break
-            
+    item_before = next(iter(plan_before), None)
     assert item_before is not None
     original_amount = item_before.total_amount
     
@@ -97,47 +106,32 @@ def test_production_plan_update(test_db, sample_data):
         order_item.save()
     
     # Get production plan again
-    plan_after = list(get_production_plan(today, today))
+    plan_after = get_production_plan(today, today, item=item)
     
     # Find our item
-    item_after = None
-    for row in plan_after:
-        if row.item.name == item.name:
-            item_after = row
-            break
-            
+    item_after = next(iter(plan_after), None)
     assert item_after is not None
     
     # The amount should be increased by 1
     assert item_after.total_amount == original_amount + 1.0
 
 
-def test_transfer_schedule_update(test_db, sample_data):
+def test_transfer_schedule_update(test_db, sample_data, today):
     """Test that changes to orders are reflected in the transfer schedule"""
     # Setup
     customer = sample_data['customers'][0]
     item = sample_data['items'][0]
     
-    today = datetime.now().date()
     next_week = today + timedelta(days=7)
     
     # Determine expected transfer date based on item parameters
     transfer_date = today + timedelta(days=item.soaking_days + item.germination_days)
     
     # Create an order with production date today
-    order = Order.create(
-        customer=customer,
-        delivery_date=next_week,
-        production_date=today,
-        from_date=None,
-        to_date=None,
-        subscription_type=0,
-        halbe_channel=False,
-        order_id=uuid.uuid4(),
-        is_future=True
-    )
+    order = make_order(customer=customer, delivery_date=next_week, production_date=today)
     
-    OrderItem.create(order=order, item=item, amount=2.0)
+    OrderItem.create(order=order, item=item, amount=2.0,
+                     production_date=today, transfer_date=transfer_date)
     
     # Get transfer schedule around the expected transfer date
     transfers_before = get_transfer_schedule(
@@ -145,23 +139,8 @@ def test_transfer_schedule_update(test_db, sample_data):
         transfer_date + timedelta(days=1)
     )
     
-    # Find our item in the transfer schedule - date could be string or date object
-    item_transfer_before = None
-    for transfer in transfers_before:
-        if transfer['item'] == item.name and (
-            transfer['date'] == transfer_date or
-            (isinstance(transfer['date'], str) and transfer_date.strftime('%Y-%m-%d') in transfer['date'])
-        ):
-            item_transfer_before = transfer
-            break
-    
-    # If we don't find the exact date, look for any instance of this item
-    if item_transfer_before is None:
-        for transfer in transfers_before:
-            if transfer['item'] == item.name:
-                item_transfer_before = transfer
-                break
-                
+    # Find our item in the transfer schedule
+    item_transfer_before = _index_transfers(transfers_before, transfer_date).get(item.name)
     assert item_transfer_before is not None, f"Item {item.name} not found in transfer schedule"
     original_amount = item_transfer_before['amount']
     
@@ -178,62 +157,34 @@ def test_transfer_schedule_update(test_db, sample_data):
     )
     
     # Find our item with the same approach
-    item_transfer_after = None
-    for transfer in transfers_after:
-        if transfer['item'] == item.name and (
-            transfer['date'] == transfer_date or
-            (isinstance(transfer['date'], str) and transfer_date.strftime('%Y-%m-%d') in transfer['date'])
-        ):
-            item_transfer_after = transfer
-            break
-    
-    # If we don't find the exact date, look for any instance of this item
-    if item_transfer_after is None:
-        for transfer in transfers_after:
-            if transfer['item'] == item.name:
-                item_transfer_after = transfer
-                break
-                
+    item_transfer_after = _index_transfers(transfers_after, transfer_date).get(item.name)
     assert item_transfer_after is not None, f"Item {item.name} not found in transfer schedule after update"
     
     # The amount should be increased by 2
     assert item_transfer_after['amount'] == original_amount + 2.0
 
 
-def test_delete_order_removes_from_schedules(test_db, sample_data):
+def test_delete_order_removes_from_schedules(test_db, sample_data, today):
     """Test that deleting an order removes it from all schedules"""
     # Setup - get items and customer
     customer = sample_data['customers'][0]
     item = sample_data['items'][0]
     
-    today = datetime.now().date()
     tomorrow = today + timedelta(days=1)
     
     # Create an order for tomorrow that we'll delete
-    order = Order.create(
-        customer=customer,
-        delivery_date=tomorrow,
-        production_date=today,
-        from_date=None,
-        to_date=None,
-        subscription_type=0,
-        halbe_channel=False,
-        order_id=uuid.uuid4(),
-        is_future=True
-    )
+    order = make_order(customer=customer, delivery_date=tomorrow, production_date=today)
     
-    OrderItem.create(order=order, item=item, amount=5.0)
+    OrderItem.create(order=order, item=item, amount=5.0, production_date=today,
+                     transfer_date=today + timedelta(days=item.soaking_days + item.germination_days))
     
     # Check delivery schedule includes our order
     deliveries = get_delivery_schedule(tomorrow, tomorrow)
     assert len(deliveries) == 1
     
     # Delete the order
-    with test_db.atomic():
-        # Delete order items first
-        OrderItem.delete().where(OrderItem.order == order).execute()
-        # Then delete the order
-        order.delete_instance()
+    # Its order items are removed by the ON DELETE CASCADE foreign key
+    order.delete_instance()
     
     # Verify schedules no longer include our order
     deliveries_after = get_delivery_schedule(tomorrow, tomorrow)
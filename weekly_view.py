@@ -1,12 +1,68 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-from database import get_delivery_schedule, get_production_plan, get_transfer_schedule, generate_subscription_orders, calculate_itemwise_production_dates  # Ensure this import is present
-from models import Order, OrderItem
+from datetime import date, datetime, timedelta
+from database import get_delivery_schedule_flat, get_production_plan, get_transfer_schedule, generate_subscription_orders, calculate_itemwise_production_dates, data_version, on_weekday  # Ensure this import is present
+from models import Customer, Item, Order, OrderItem, SUBSCRIPTION_TYPES, SUBSCRIPTION_LABELS
+from peewee import chunked, prefetch
 from widgets import AutocompleteCombobox
 import ttkbootstrap as ttkb
 import uuid
 import time
+import logging
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict, deque
+from statistics import median
+from itertools import groupby
+from operator import attrgetter, itemgetter
+
+logger = logging.getLogger(__name__)
+
+# Format of the dates shown in and read from the views (see format_date)
+DATE_FORMAT = "%d.%m.%Y"
+
+# German day names, Monday first, and their weekday numbers
+DAYS = ('Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag')
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
+# Fonts of the weekly views, shared by all their labels and canvas texts
+FONT_TITLE = ('Arial', 12, 'bold')
+FONT_HEADING = ('Arial', 11, 'bold')
+FONT_ITEM = ('Arial', 11)
+FONT_TEXT = ('Arial', 10)
+FONT_NOTE = ('Arial', 10, 'italic')
+FONT_SMALL = ('Arial', 9)
+
+# Layout of the delivery cards, which are drawn on the day canvases; the
+# cards of a day are laid out from these before any of them is drawn
+CARD_PADDING = 5        # space between the card border and its content
+CARD_HEADER_HEIGHT = 30 # customer name box, when the name fits on one line
+CARD_TITLE_MARGIN = 5   # space around the customer name in its box
+CARD_BASE_HEIGHT = 62   # header, separator and paddings
+CARD_ITEM_HEIGHT = 22   # one order item line
+CARD_SPACING = 10       # gap around each card
+
+# Colors of the clickable customer header (Bootstrap primary and a darker shade)
+CARD_HEADER_COLOR = '#007BFF'
+CARD_HEADER_ACTIVE_COLOR = '#0056b3'
+
+# Number of weeks whose deliveries the delivery view keeps in memory
+DELIVERY_CACHE_WEEKS = 8
+
+# Throttle of the production and transfer views: the time between redraws
+# is twice the median of the last REDRAW_SAMPLES redraws, and at least
+# MIN_REFRESH_THROTTLE ms
+MIN_REFRESH_THROTTLE = 250
+REDRAW_SAMPLES = 10
+
+_theme_colors = None
+
+def theme_colors():
+    """Colors of the darkly theme. The theme is set up on the first call
+    only; ttk styles are global, so all views share it."""
+    global _theme_colors
+    if _theme_colors is None:
+        _theme_colors = ttkb.Style('darkly').colors
+    return _theme_colors
 
 class WeeklyBaseView:
     def __init__(self, parent):
@@ -17,6 +73,8 @@ class WeeklyBaseView:
         self.day_labels = {}
         self.button_frames = {}
         self.scrollbars = {}
+        self.refresh_after_id = None  # Pending refresh of schedule_refresh
+        self.refresh_app_pending = False
         self.create_widgets()
         
     def create_widgets(self):
@@ -44,7 +102,7 @@ class WeeklyBaseView:
         self.parent.pack_propagate(False)
         
         monday = self.get_monday_of_week()
-        days = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+        days = DAYS
         
         # Configure column weights to ensure equal sizing
         for i in range(7):
@@ -55,7 +113,7 @@ class WeeklyBaseView:
         
         for i, day in enumerate(days):
             date = monday + timedelta(days=i)
-            date_str = date.strftime('%d.%m')
+            date_str = f"{date.day:02d}.{date.month:02d}"
             day_label = f"{day} ({date_str})"
 
             # Create labeled frame for each day
@@ -99,62 +157,110 @@ class WeeklyBaseView:
             inner_frame.bind("<Configure>", configure_scroll_region)
             canvas.bind("<Configure>", configure_window_size)
             
-            # Bind mousewheel events for scrolling
-            def on_mousewheel(event, canvas=canvas):
-                canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-            
-            # Bind specific canvas to mousewheel when mouse enters
-            def on_enter(event, canvas=canvas):
-                canvas.bind_all("<MouseWheel>", lambda e, c=canvas: on_mousewheel(e, c))
-            
-            # Unbind mousewheel when mouse leaves
-            def on_leave(event):
-                canvas.unbind_all("<MouseWheel>")
-            
-            canvas.bind("<Enter>", on_enter)
-            canvas.bind("<Leave>", on_leave)
-            
             # Linux scrolling
             canvas.bind("<Button-4>", lambda e, c=canvas: c.yview_scroll(-1, "units"))
             canvas.bind("<Button-5>", lambda e, c=canvas: c.yview_scroll(1, "units"))
         
+        # Mousewheel scrolling, bound once for the whole view; the handler
+        # finds the day under the pointer itself
+        self.parent.bind_all("<MouseWheel>", self.on_mousewheel, add='+')
+        
         self.update_week_label()
         self.highlight_current_day()
         
         # Force layout update to ensure proper dimensions
         self.parent.update_idletasks()
         
+    def on_mousewheel(self, event):
+        """Scroll the day canvas under the pointer, if it belongs to this view"""
+        try:
+            widget = self.parent.winfo_containing(event.x_root, event.y_root)
+        except KeyError:  # a Tk internal window, e.g. a combobox popdown
+            return
+        canvases = self.canvases.values()
+        while widget is not None:
+            if widget in canvases:
+                widget.yview_scroll(int(-1 * (event.delta / 120)), "units")
+                return
+            widget = widget.master
+        
     def previous_week(self):
         self.current_week -= timedelta(days=7)
         self.update_week_label()
-        self.refresh()
         # Auto-refresh all tabs when navigating weeks
-        if hasattr(self, 'app') and hasattr(self.app, 'throttled_refresh'):
-            self.app.throttled_refresh()
+        self.schedule_refresh(refresh_app=True)
 
     
     def today_week(self):
         self.current_week = datetime.now().date()
         self.update_week_label()
         self.update_day_labels()
-        self.refresh()
+        self.schedule_refresh()
 
     def next_week(self):
         self.current_week += timedelta(days=7)
         self.update_week_label()
-        self.refresh()
         # Auto-refresh all tabs when navigating weeks
-        if hasattr(self, 'app') and hasattr(self.app, 'throttled_refresh'):
+        self.schedule_refresh(refresh_app=True)
+
+    def schedule_refresh(self, refresh_app=False, delay=120):
+        """Refresh the view (and all tabs if refresh_app) after a short delay.
+        Calls made before the refresh runs are merged into it, so clicking
+        through several weeks only loads the week that is shown last."""
+        self.refresh_app_pending = self.refresh_app_pending or refresh_app
+        if self.refresh_after_id is not None:
+            self.parent.after_cancel(self.refresh_after_id)
+        self.refresh_after_id = self.parent.after(delay, self.run_scheduled_refresh)
+
+    def run_scheduled_refresh(self):
+        self.refresh_after_id = None
+        refresh_app, self.refresh_app_pending = self.refresh_app_pending, False
+        self.refresh()
+        if refresh_app and hasattr(self, 'app') and hasattr(self.app, 'throttled_refresh'):
             self.app.throttled_refresh()
 
+    def week_key(self):
+        """(monday, data_version()) of the week to show, with None for the
+        version while it is unknown; a view drawn for the same key is up to
+        date"""
+        version = data_version()
+        return (self.get_monday_of_week(), version) if version is not None else None
+
+    def throttle(self, redraw):
+        """Call redraw, at most once per refresh_throttle ms. A call that
+        comes too soon is not dropped but runs at the end of the window, and
+        all calls until then are merged into it, so the last one of a burst
+        is always shown."""
+        if self.pending_redraw_id is not None:
+            return
+        current_time = time.monotonic_ns() // 1_000_000  # Monotonic time in ms
+        wait = self.last_refresh_time + self.refresh_throttle - current_time
+        if wait > 0:
+            self.pending_redraw_id = self.parent.after(wait, self.run_pending_redraw, redraw)
+            return
+        self.last_refresh_time = current_time
+        self.timed_redraw(redraw)
+
+    def run_pending_redraw(self, redraw):
+        self.pending_redraw_id = None
+        self.last_refresh_time = time.monotonic_ns() // 1_000_000
+        self.timed_redraw(redraw)
+
+    def timed_redraw(self, redraw):
+        """Call redraw and fit refresh_throttle to how long redraws take"""
+        start = time.perf_counter()
+        redraw()
+        self.redraw_durations.append(time.perf_counter() - start)
+        self.refresh_throttle = max(MIN_REFRESH_THROTTLE, int(2000 * median(self.redraw_durations)))
+
 
     def update_day_labels(self):
         monday = self.get_monday_of_week()
-        days = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+        days = DAYS
         
         for i, day in enumerate(days):
             date = monday + timedelta(days=i)
-            date_str = date.strftime('%d.%m')
+            date_str = f"{date.day:02d}.{date.month:02d}"
             day_label = f"{day} ({date_str})"
             
             if day in self.day_labels:
@@ -164,7 +270,7 @@ class WeeklyBaseView:
         monday = self.current_week - timedelta(days=self.current_week.weekday())
         sunday = monday + timedelta(days=6)
         self.week_label.config(
-            text=f"Woche {monday.strftime('%d.%m.%Y')} - {sunday.strftime('%d.%m.%Y')}"
+            text=f"Woche {format_date(monday)} - {format_date(sunday)}"
         )
     
     def clear_day_frames(self):
@@ -177,20 +283,7 @@ class WeeklyBaseView:
 
     def highlight_current_day(self):
         today = datetime.now().date()
-        
-        # Mapping between English day names and German day names
-        day_mapping = {
-            'Monday': 'Montag',
-            'Tuesday': 'Dienstag',
-            'Wednesday': 'Mittwoch',
-            'Thursday': 'Donnerstag',
-            'Friday': 'Freitag',
-            'Saturday': 'Samstag',
-            'Sunday': 'Sonntag'
-        }
-        
-        day_name = today.strftime('%A')  # This gives English day name
-        german_day_name = day_mapping.get(day_name)  # Map to German day name
+        german_day_name = DAYS[today.weekday()]
         
         if german_day_name in self.day_labels:
             frame = self.day_labels[german_day_name]
@@ -201,6 +294,132 @@ class WeeklyBaseView:
                 # Fallback if style not available
                 frame.configure(background='green')
 
+class WeekDelivery:
+    """A delivery as the delivery view shows it: order id, delivery date,
+    customer name and the (item name, amount) pairs sorted by item name"""
+    __slots__ = ('id', 'delivery_date', 'customer_name', 'items', 'sort_key')
+
+    def __init__(self, order_id, delivery_date, customer_name, items):
+        self.id = order_id
+        self.delivery_date = delivery_date
+        self.customer_name = customer_name
+        self.items = items
+        self.sort_key = customer_name.casefold()
+
+def card_title_width(width):
+    """Width the customer name of a card of width is wrapped at; 0 (no
+    wrapping) while the canvas is too small to have a width yet"""
+    return max(width - 2 * (CARD_PADDING + CARD_TITLE_MARGIN), 0)
+
+class DeliveryCard:
+    """One delivery card, drawn as items on a day canvas. Cards are kept
+    when they scroll out of view and reused for other deliveries, so only
+    their texts and positions change."""
+    count = 0
+
+    def __init__(self, view, canvas):
+        DeliveryCard.count += 1
+        self.view = view
+        self.canvas = canvas
+        self.delivery = None
+        self.x = self.y = self.width = 0
+        self.texts = {}  # text item -> text it currently shows
+        self.title_width = 0  # width the customer name is wrapped at
+        self.tag = f'card{DeliveryCard.count}'
+        header_tag = f'{self.tag}_header'
+        
+        # Card border, customer name header and separator
+        self.border = canvas.create_rectangle(0, 0, 0, 0, outline=view.colors.border,
+                                              tags=('card', self.tag))
+        self.header = canvas.create_rectangle(0, 0, 0, 0, fill=CARD_HEADER_COLOR,
+                                              outline=CARD_HEADER_ACTIVE_COLOR,
+                                              tags=('card', self.tag, header_tag))
+        self.title = canvas.create_text(0, 0, anchor='nw', fill='white',
+                                        font=FONT_TITLE,
+                                        tags=('card', self.tag, header_tag))
+        self.separator = canvas.create_line(0, 0, 0, 0, fill=view.colors.border,
+                                            tags=('card', self.tag))
+        # One text item per order item; only the first shown_items are visible
+        self.item_texts = []
+        self.shown_items = 0
+        
+        # Make the header clickable, with a hover color
+        canvas.tag_bind(header_tag, "<Button-1>", self.on_click)
+        canvas.tag_bind(header_tag, "<Enter>",
+                        lambda e: canvas.itemconfigure(self.header, fill=CARD_HEADER_ACTIVE_COLOR))
+        canvas.tag_bind(header_tag, "<Leave>",
+                        lambda e: canvas.itemconfigure(self.header, fill=CARD_HEADER_COLOR))
+        
+        self.hide()
+    
+    def on_click(self, event):
+        if self.delivery is not None:
+            # The card only knows the order id; the editor needs the order
+            # (with its customer, for the window title)
+            order = (Order.select(Order, Customer).join(Customer)
+                     .where(Order.id == self.delivery.id).first())
+            if order is not None:
+                self.view.open_order_editor(order.delivery_date, order)
+    
+    def set_text(self, text_id, text):
+        """Configure the text of a text item, unless it already shows it"""
+        if self.texts.get(text_id) != text:
+            self.canvas.itemconfigure(text_id, text=text)
+            self.texts[text_id] = text
+    
+    def hide(self):
+        self.canvas.itemconfigure(self.tag, state='hidden')
+    
+    def show(self, delivery, x, y, width):
+        """Draw the customer and items of a delivery at x, y"""
+        self.delivery = delivery
+        self.set_text(self.title, delivery.customer_name)
+        
+        while len(self.item_texts) < len(delivery.items):
+            self.item_texts.append(self.canvas.create_text(
+                0, 0, anchor='nw', fill=self.view.colors.fg,
+                font=FONT_ITEM, tags=('card', self.tag)
+            ))
+        for text_id, (item_name, amount) in zip(self.item_texts, delivery.items):
+            self.set_text(text_id, f"{item_name}: {amount:.1f}")
+        self.shown_items = len(delivery.items)
+        
+        self.place(x, y, width)
+        
+        # Show the whole card with one call, then hide the item texts it
+        # does not use
+        itemconfigure = self.canvas.itemconfigure
+        itemconfigure(self.tag, state='normal')
+        for text_id in self.item_texts[self.shown_items:]:
+            itemconfigure(text_id, state='hidden')
+    
+    def place(self, x, y, width):
+        """Move the card to x, y and stretch it to width"""
+        self.x, self.y, self.width = x, y, width
+        
+        # The customer name wraps inside its box, which grows to fit it
+        title_width = card_title_width(width)
+        if title_width != self.title_width:
+            self.canvas.itemconfigure(self.title, width=title_width)
+            self.title_width = title_width
+        header_height = self.view.header_height(self.canvas, self.delivery.customer_name, width)
+        
+        height = (CARD_BASE_HEIGHT + header_height - CARD_HEADER_HEIGHT
+                  + CARD_ITEM_HEIGHT * self.shown_items)
+        inner_left, inner_right = x + CARD_PADDING, x + width - CARD_PADDING
+        header_bottom = y + CARD_PADDING + header_height
+        separator_y = header_bottom + 8
+        
+        coords = self.canvas.coords
+        coords(self.border, x, y, x + width, y + height)
+        coords(self.header, inner_left, y + CARD_PADDING, inner_right, header_bottom)
+        coords(self.title, inner_left + CARD_TITLE_MARGIN, y + CARD_PADDING + CARD_TITLE_MARGIN)
+        coords(self.separator, inner_left, separator_y, inner_right, separator_y)
+        text_x, text_y = inner_left + 10, separator_y + 8
+        for text_id in self.item_texts[:self.shown_items]:
+            coords(text_id, text_x, text_y)
+            text_y += CARD_ITEM_HEIGHT
+
 class WeeklyDeliveryView(WeeklyBaseView):
     def __init__(self, parent, app, db):
         super().__init__(parent)
@@ -208,24 +427,41 @@ class WeeklyDeliveryView(WeeklyBaseView):
         self.new_order_widgets = {}  # Will hold new order widgets for each day
         self.db = db
         self.edit_callback = None  # Callback for notifying app of edits
-
-        # Define a custom style for clickable labels using ttkbootstrap
-        style = ttkb.Style('darkly')
-        style.configure('Clickable.TLabel', 
-                        background='#007BFF',  # Bootstrap primary color
-                        foreground='white', 
-                        borderwidth=1, 
-                        relief='solid', 
-                        padding=5, 
-                        bordercolor='#0056b3')  # Darker shade for border
-
-        # Optional: Change background on hover/active state
-        style.map('Clickable.TLabel', background=[('active', '#0056b3')])
-
-        # Add a "+" button to each day frame to add a new order
-        for day, frame in self.day_frames.items():
-            add_order_button = ttk.Button(frame, text="+", command=lambda day=day: self.open_new_order_window(day))
-            add_order_button.pack(side='top', anchor='ne', padx=5, pady=5)
+        self.other_views_after_id = None  # Pending refresh_other_views
+        self.delivery_cache = OrderedDict()  # (monday, sunday) -> (data version, deliveries)
+
+        # Theme colors, used for the cards drawn on the canvases
+        self.colors = theme_colors()
+
+        # The delivery cards are drawn on each day's canvas directly and
+        # only while they are in view (see show_visible_cards)
+        self.day_deliveries = {day: [] for day in self.canvases}
+        self.card_tops = {day: [0] for day in self.canvases}
+        self.shown_cards = {day: {} for day in self.canvases}  # order id -> DeliveryCard
+        self.card_pool = {day: [] for day in self.canvases}  # hidden cards ready for reuse
+        self.layout_widths = {day: None for day in self.canvases}  # card width of the last layout
+        # Customer names are measured with an off-screen text item of each
+        # canvas, so a card's height is known before it is drawn
+        self.title_probes = {}  # canvas -> text item
+        self.header_heights = {}  # card width -> {customer name -> header height}
+        for day, canvas in self.canvases.items():
+            canvas.delete('inner_frame')
+            self.title_probes[canvas] = canvas.create_text(-10000, -10000, anchor='nw', font=FONT_TITLE)
+            canvas.configure(yscrollcommand=lambda first, last, day=day: self.on_day_scrolled(day, first, last))
+            canvas.bind("<Configure>", lambda e, day=day: self.on_day_resized(day, e), add='+')
+
+        # Add a "+" button to each day to add a new order. The buttons stay
+        # for the lifetime of the view; refresh never touches them.
+        self.add_buttons = {}
+        for day, frame in self.button_frames.items():
+            add_order_button = ttk.Button(
+                frame,
+                text="+",
+                width=3,
+                command=lambda d=day: self.open_new_order_window(d)
+            )
+            add_order_button.pack(side='right', padx=5, pady=5)
+            self.add_buttons[day] = add_order_button
 
     def set_edit_callback(self, callback):
         """Set a callback function to be called when an order is edited
@@ -245,7 +481,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
         
         ttk.Label(customer_frame, text="Kunde:").pack(side='left', padx=5)
         customer_combo = AutocompleteCombobox(customer_frame, width=50)
-        customer_combo.set_completion_list(sorted(self.app.customers.keys()))
+        customer_combo.set_completion_index(self.app.customer_completion)
         customer_combo.pack(side='left', padx=5, fill='x', expand=True)
         
         # Items Frame
@@ -258,7 +494,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
         
         ttk.Label(add_frame, text="Artikel:").pack(side='left', padx=5)
         item_combo = AutocompleteCombobox(add_frame, width=30)
-        item_combo.set_completion_list(sorted(self.app.items.keys()))
+        item_combo.set_completion_index(self.app.item_completion)
         item_combo.pack(side='left', padx=5)
         
         ttk.Label(add_frame, text="Menge:").pack(side='left', padx=5)
@@ -334,8 +570,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
         
         # Set default date to the selected day
         monday = self.get_monday_of_week()
-        days_index = {"Montag": 0, "Dienstag": 1, "Mittwoch": 2, "Donnerstag": 3, "Freitag": 4, "Samstag": 5, "Sonntag": 6}
-        selected_date = monday + timedelta(days=days_index[day])
+        selected_date = monday + timedelta(days=DAY_INDEX[day])
         self.app.set_date_entry(delivery_date, selected_date)
         
         # Subscription Frame
@@ -343,13 +578,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
         sub_frame.pack(fill='x', pady=5)
         
         sub_var = tk.IntVar(value=0)
-        sub_types = {
-            0: "Kein Abonnement",
-            1: "Wöchentlich",
-            2: "Zweiwöchentlich",
-            3: "Alle 3 Wochen",
-            4: "Alle 4 Wochen"
-        }
+        sub_types = SUBSCRIPTION_TYPES
         for val, text in sub_types.items():
             ttk.Radiobutton(sub_frame, text=text, variable=sub_var, 
                           value=val).pack(side='left', padx=5)
@@ -388,6 +617,28 @@ class WeeklyDeliveryView(WeeklyBaseView):
                 max_days = max(item['item'].total_days for item in order_items)
                 production_date = delivery_date_value - timedelta(days=max_days)
                 
+                # Time before delivery of the production and from production to
+                # transfer of each item
+                item_days = [
+                    (item_data['item'], item_data['amount'],
+                     timedelta(days=item_data['item'].germination_days + item_data['item'].growth_days),
+                     timedelta(days=item_data['item'].germination_days))
+                    for item_data in order_items
+                ]
+                
+                def order_item_rows(order_id, order_delivery_date):
+                    rows = []
+                    for item, amount, production_lead, transfer_lead in item_days:
+                        item_production_date = order_delivery_date - production_lead
+                        rows.append({
+                            'order': order_id,
+                            'item': item,
+                            'amount': amount,
+                            'production_date': item_production_date,
+                            'transfer_date': item_production_date + transfer_lead
+                        })
+                    return rows
+                
                 with self.db.atomic():
                     # Create order
                     order = Order.create(
@@ -403,51 +654,29 @@ class WeeklyDeliveryView(WeeklyBaseView):
                     )
                     
                     # Create order items
-                    for item_data in order_items:
-                        item = item_data['item']
-                        amount = item_data['amount']
-                        total_days = item.germination_days + item.growth_days
-                        production_date = delivery_date_value - timedelta(days=total_days)
-                        transfer_date = production_date + timedelta(days=item.germination_days)
-                        print("[DEBUG] VOR CREATE:", item.name, production_date, transfer_date)
-                        oi = OrderItem.create(
-                            order=order,
-                            item=item,
-                            amount=amount,
-                            production_date=production_date,
-                            transfer_date=transfer_date
-    )
-                        oi.save()
-                        print("[DEBUG] NACH SAVE:", oi.item.name, oi.transfer_date)
+                    OrderItem.insert_many(order_item_rows(order.id, delivery_date_value)).execute()
                     
                     # Generate subscription orders if applicable
                     if sub_var.get() > 0:
-                        future_orders = generate_subscription_orders(order)
-                        for future_order_data in future_orders:
-                            future_order = Order.create(
-                                **future_order_data,
-                                order_id=uuid.uuid4()
-                            )
-                            # Copy items to future order
-                            for item_data in order_items:
-                                item = item_data['item']
-                                amount = item_data['amount']
-                                total_days = item.germination_days + item.growth_days
-                                production_date = future_order.delivery_date - timedelta(days=total_days)
-                                transfer_date = production_date + timedelta(days=item.germination_days)
-                                print("[DEBUG] VOR CREATE:", item.name, production_date, transfer_date)
-                                oi = OrderItem.create(
-                                    order=future_order,
-                                    item=item,
-                                    amount=amount,
-                                    production_date=production_date,
-                                    transfer_date=transfer_date
-    )
-                                oi.save()
-                                print("[DEBUG] NACH SAVE:", oi.item.name, oi.transfer_date)
+                        future_orders = []
+                        for future_order_data in generate_subscription_orders(order):
+                            # production_date is computed per item below and is not an Order column
+                            future_order_data.pop('production_date', None)
+                            future_orders.append(dict(future_order_data, order_id=uuid.uuid4()))
+                        
+                        # Create the future orders, then copy the items to them
+                        # (in batches, to stay below SQLite's variable limit)
+                        future_items = []
+                        for batch in chunked(future_orders, 100):
+                            created = Order.insert_many(batch).returning(Order.id, Order.delivery_date).tuples().execute()
+                            for future_order_id, future_delivery_date in created:
+                                future_items.extend(order_item_rows(future_order_id, future_delivery_date))
+                        for batch in chunked(future_items, 100):
+                            OrderItem.insert_many(batch).execute()
                 
                 messagebox.showinfo("Erfolg", "Bestellung erfolgreich gespeichert!")
                 new_order_window.destroy()
+                self.invalidate_cache()
                 self.refresh()
                 
             except Exception as e:
@@ -458,114 +687,160 @@ class WeeklyDeliveryView(WeeklyBaseView):
                   command=save_order).pack(pady=10)
 
     def refresh(self):
-        def safe_customer_name(order_item):
-            try:
-                return order_item.order.customer.name.lower()
-            except:
-                return ""
-
-        self.clear_day_frames()
         monday = self.get_monday_of_week()
         end_of_week = monday + timedelta(days=6)
-        deliveries = get_delivery_schedule(monday, end_of_week)
+        deliveries = self.get_week_deliveries(monday, end_of_week)
 
-        days = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
-        for i, day in enumerate(days):
-            date = monday + timedelta(days=i)
-            date_str = date.strftime('%d.%m')
-            day_label = f"{day} ({date_str})"
-            
-            # Update day labels
-            if day in self.day_labels:
-                self.day_labels[day].configure(text=day_label)
+        days = DAYS
         
-        # Clear button frames and add + buttons
-        for day in days:
-            # Clear existing buttons
-            for widget in self.button_frames[day].winfo_children():
-                widget.destroy()
-                
-            # Add new + button
-            add_order_button = ttk.Button(
-                self.button_frames[day],
-                text="+",
-                width=3,
-                command=lambda d=day: self.open_new_order_window(d)
-            )
-            add_order_button.pack(side='right', padx=5, pady=5)
-                            
-        # Group deliveries by day name
-        deliveries_by_day = {day: [] for day in days}
+        # Group deliveries by day name, then sort each day by customer name
+        # alphabetically
+        deliveries_by_day = defaultdict(list)
         for delivery in deliveries:
-            day_name = days[delivery.delivery_date.weekday()]
-            deliveries_by_day[day_name].append(delivery)
+            deliveries_by_day[days[delivery.delivery_date.weekday()]].append(delivery)
+        for day_list in deliveries_by_day.values():
+            day_list.sort(key=attrgetter('sort_key'))
         
-        # Display deliveries for each day
-        for day in days:
-            frame = self.day_frames[day]
-            
-            # Sort deliveries by customer name alphabetically
-            day_deliveries = sorted(deliveries_by_day[day], key=lambda d: d.customer.name.lower())
-            
-            # Display existing orders for this day in the scrollable frame
-            for delivery in day_deliveries:
-                # Skip orders with no items
-                if not delivery.order_items.exists():
-                    continue
-
-                # Create a frame for each customer with a border and padding
-                customer_frame = ttk.Frame(frame, relief='groove', borderwidth=1)
-                customer_frame.pack(fill='x', padx=5, pady=5, ipadx=5, ipady=5)
-                
-                # Customer name header
-                customer_label = ttk.Label(
-                    customer_frame,
-                    text=delivery.customer.name,
-                    font=('Arial', 12, 'bold'),
-                    style='Clickable.TLabel',
-                    wraplength=200,  # Fixed width to ensure text is visible
-                    anchor='w'
-                )
-                customer_label.pack(anchor='w', fill='x', padx=5, pady=5)
-
-                # Make label clickable
-                customer_label.bind(
-                    "<Button-1>", 
-                    lambda e, order=delivery: self.open_order_editor(delivery.delivery_date, order)
-                )
-                
-                # Add a separator
-                ttk.Separator(customer_frame, orient='horizontal').pack(fill='x', padx=5, pady=3)
-                
-                # Create a frame for items
-                items_frame = ttk.Frame(customer_frame)
-                items_frame.pack(fill='x', padx=5, pady=5)
-                
-                # Sort order items alphabetically by name
-                sorted_items = sorted(delivery.order_items, key=lambda item: item.item.name.lower())
-                
-                # List order items in a clean layout
-                for index, order_item in enumerate(sorted_items):
-                    item_frame = ttk.Frame(items_frame)
-                    item_frame.pack(fill='x', pady=2)
-                    
-                    item_text = f"{order_item.item.name}: {order_item.amount:.1f}"
-                    ttk.Label(
-                        item_frame, 
-                        text=item_text,
-                        font=('Arial', 11)
-                    ).pack(anchor='w', padx=10)
-
-            # Make sure canvases are properly configured for scrolling
-            if day in self.canvases:
-                self.canvases[day].update_idletasks()
-                self.canvases[day].configure(scrollregion=self.canvases[day].bbox("all"))
+        # Update the label of each day and lay out its deliveries; only the
+        # visible ones are drawn
+        for i, day in enumerate(days):
+            date = monday + timedelta(days=i)
+            self.day_labels[day].configure(text=f"{day} ({date.day:02d}.{date.month:02d})")
+            self.layout_day(day, deliveries_by_day[day])
         
         # After refreshing delivery view, request refreshes for other views
         self.refresh_other_views()
         
+    def get_week_deliveries(self, monday, end_of_week):
+        """
+        The deliveries of a week as WeekDelivery objects, reusing the result
+        of an earlier refresh. A cached week is only used while the database is unchanged
+        since it was loaded; invalidate_cache drops all of them.
+        """
+        key = (monday, end_of_week)
+        version = data_version()
+        cached = self.delivery_cache.get(key)
+        if version is not None and cached is not None and cached[0] == version:
+            self.delivery_cache.move_to_end(key)
+            return cached[1]
+        
+        # One WeekDelivery per order from the flat rows, which come grouped
+        # by order; orders without items have no rows
+        deliveries = []
+        rows = get_delivery_schedule_flat(monday, end_of_week)
+        for (order_id, delivery_date, customer_name), order_rows in groupby(rows, key=itemgetter(0, 1, 2)):
+            # Sort order items alphabetically by name
+            items = sorted(((row[3], row[4]) for row in order_rows), key=lambda item: item[0].lower())
+            deliveries.append(WeekDelivery(order_id, delivery_date, customer_name, items))
+        if version is not None:
+            self.delivery_cache[key] = (version, deliveries)
+            self.delivery_cache.move_to_end(key)
+            while len(self.delivery_cache) > DELIVERY_CACHE_WEEKS:
+                self.delivery_cache.popitem(last=False)
+        return deliveries
+
+    def invalidate_cache(self):
+        """Forget the cached deliveries, e.g. after orders were written"""
+        self.delivery_cache.clear()
+
+    def header_height(self, canvas, customer_name, width):
+        """Height of the customer name box of a card of width, with the
+        name wrapped to fit"""
+        heights = self.header_heights.setdefault(width, {})
+        height = heights.get(customer_name)
+        if height is None:
+            probe = self.title_probes[canvas]
+            canvas.itemconfigure(probe, text=customer_name, width=card_title_width(width))
+            bbox = canvas.bbox(probe)
+            text_height = bbox[3] - bbox[1] if bbox else 0
+            height = max(CARD_HEADER_HEIGHT, text_height + 2 * CARD_TITLE_MARGIN)
+            heights[customer_name] = height
+        return height
+
+    def card_height(self, canvas, delivery, width):
+        """Height of a delivery card of width including the gap around it"""
+        return (CARD_BASE_HEIGHT + self.header_height(canvas, delivery.customer_name, width)
+                - CARD_HEADER_HEIGHT + CARD_ITEM_HEIGHT * len(delivery.items) + CARD_SPACING)
+
+    def layout_day(self, day, deliveries):
+        """Compute where the cards of a day go and show the visible ones"""
+        canvas = self.canvases[day]
+        self.hide_cards(day, keep=())
+        
+        width = max(canvas.winfo_width() - CARD_SPACING, 1)
+        tops = [0]
+        for delivery in deliveries:
+            tops.append(tops[-1] + self.card_height(canvas, delivery, width))
+        self.layout_widths[day] = width
+        self.day_deliveries[day] = deliveries
+        self.card_tops[day] = tops
+        
+        canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), tops[-1]))
+        self.show_visible_cards(day)
+
+    def show_visible_cards(self, day):
+        """Show the cards that intersect the visible part of the day's
+        canvas and hide the ones that scrolled out of view"""
+        canvas = self.canvases[day]
+        deliveries = self.day_deliveries[day]
+        tops = self.card_tops[day]
+        
+        y0 = canvas.canvasy(0)
+        y1 = y0 + canvas.winfo_height()
+        first = max(bisect_right(tops, y0) - 1, 0)
+        last = min(bisect_left(tops, y1), len(deliveries))
+        visible = deliveries[first:last]
+        
+        self.hide_cards(day, keep={d.id for d in visible})
+        
+        shown = self.shown_cards[day]
+        pool = self.card_pool[day]
+        width = max(canvas.winfo_width() - CARD_SPACING, 1)
+        for index, delivery in enumerate(visible, start=first):
+            if delivery.id in shown:
+                continue
+            # Reuse a hidden card if there is one
+            card = pool.pop() if pool else DeliveryCard(self, canvas)
+            card.show(delivery, CARD_SPACING // 2, tops[index] + CARD_SPACING // 2, width)
+            shown[delivery.id] = card
+
+    def hide_cards(self, day, keep):
+        """Hide the shown cards of a day whose order id is not in keep and
+        put them back into the day's pool"""
+        canvas = self.canvases[day]
+        shown = self.shown_cards[day]
+        for order_id in [order_id for order_id in shown if order_id not in keep]:
+            card = shown.pop(order_id)
+            card.hide()
+            self.card_pool[day].append(card)
+
+    def on_day_scrolled(self, day, first, last):
+        """yscrollcommand of the day canvases: update the scrollbar and
+        show the cards that scrolled into view"""
+        self.scrollbars[day].set(first, last)
+        self.show_visible_cards(day)
+
+    def on_day_resized(self, day, event):
+        """Lay the cards out again for a new canvas width, as the customer
+        names may wrap differently, or fill a taller view"""
+        width = max(event.width - CARD_SPACING, 1)
+        if width != self.layout_widths[day]:
+            self.layout_day(day, self.day_deliveries[day])
+            # Forget the heights measured for widths no day has any more
+            for old_width in self.header_heights.keys() - set(self.layout_widths.values()):
+                del self.header_heights[old_width]
+        else:
+            self.show_visible_cards(day)
+
     def refresh_other_views(self):
-        """Tell the main app to refresh production and transfer views"""
+        """Tell the main app to refresh production and transfer views, once
+        for a burst of delivery view refreshes"""
+        if self.other_views_after_id is not None:
+            self.parent.after_cancel(self.other_views_after_id)
+        self.other_views_after_id = self.parent.after(150, self.run_other_views_refresh)
+
+    def run_other_views_refresh(self):
+        self.other_views_after_id = None
         # Only refresh other views if we have an app reference
         if hasattr(self, 'app') and self.app is not None:
             # Use the throttled refresh mechanism if available
@@ -581,7 +856,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
             new_order_frame = ttk.Frame(frame, relief='ridge', borderwidth=1)
             # An autocomplete entry for selecting a customer
             new_order_entry = AutocompleteCombobox(new_order_frame, width=20)
-            new_order_entry.set_completion_list(sorted(self.app.customers.keys()))
+            new_order_entry.set_completion_index(self.app.customer_completion)
             new_order_entry.pack(side='left', padx=5)
             # A button to create a new order
             new_order_button = ttk.Button(new_order_frame, text="New Order", 
@@ -608,8 +883,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
         # Read the customer name (if any) from the new order entry
         customer_name = entry.get()
         monday = self.get_monday_of_week()
-        days_index = {"Montag": 0, "Dienstag": 1, "Mittwoch": 2, "Donnerstag": 3, "Freitag": 4, "Samstag": 5, "Sonntag": 6}
-        delivery_date = monday + timedelta(days=days_index[day])
+        delivery_date = monday + timedelta(days=DAY_INDEX[day])
         # Open the order editor in "create" mode (order=None) with an optional prefilled customer name
         self.open_order_editor(delivery_date, order=None, prefill_customer=customer_name)
 
@@ -619,20 +893,22 @@ class WeeklyDeliveryView(WeeklyBaseView):
         The delivery_date is pre-set; if prefill_customer is provided (for new orders), that value pre-fills the customer field.
         Now handles subscription editing and updates all related future orders.
         """
-        # Store original order data for undo if editing
-        original_order_data = None
-        original_future_orders_data = []
+        # Original order data for undo if editing. It is only serialized
+        # when the order is saved, so opening and cancelling the editor
+        # does not read the whole subscription.
+        undo_snapshot = {'order': None, 'future': []}
         
-        if order and hasattr(self.app, 'serialize_order'):
+        def snapshot_for_undo():
+            if not order or not self.edit_callback or not hasattr(self.app, 'serialize_order'):
+                return
             try:
                 # Save the current order data
-                original_order_data = self.app.serialize_order(order)
+                undo_snapshot['order'] = self.app.serialize_order(order)
                 print(f"Original order data saved for undo: Order ID {order.id}")
                 
                 # Also save data for all related future orders if they exist
                 if order.from_date and order.to_date and order.subscription_type > 0:
                     # Find all future orders in this subscription (excluding the current order)
-                    today = datetime.now().date()
                     future_orders = list(Order.select().where(
                         (Order.from_date == order.from_date) &
                         (Order.to_date == order.to_date) &
@@ -642,16 +918,16 @@ class WeeklyDeliveryView(WeeklyBaseView):
                     
                     if future_orders:
                         # Serialize all the future orders
-                        original_future_orders_data = self.app.collect_orders_data(future_orders)
-                        print(f"Also saved {len(original_future_orders_data)} future orders for undo")
+                        undo_snapshot['future'] = self.app.collect_orders_data(future_orders)
+                        print(f"Also saved {len(undo_snapshot['future'])} future orders for undo")
             except Exception as e:
                 print(f"Error serializing order data: {str(e)}")
         
         edit_window = tk.Toplevel(self.parent)
         if order:
-            edit_window.title(f"Edit Order for {order.customer.name} on {order.delivery_date.strftime('%d.%m.%Y')}")
+            edit_window.title(f"Edit Order for {order.customer.name} on {format_date(order.delivery_date)}")
         else:
-            edit_window.title(f"Create New Order for {delivery_date.strftime('%d.%m.%Y')}")
+            edit_window.title(f"Create New Order for {format_date(delivery_date)}")
         
         edit_window.geometry("700x600")  # Set a larger size for the window
         
@@ -665,10 +941,10 @@ class WeeklyDeliveryView(WeeklyBaseView):
         # Use the order's actual delivery date if editing an existing order
         if order:
             # Use the order's actual delivery date for existing orders
-            delivery_date_entry.insert(0, order.delivery_date.strftime('%d.%m.%Y'))
+            delivery_date_entry.insert(0, format_date(order.delivery_date))
         else:
             # Use the passed date parameter for new orders
-            delivery_date_entry.insert(0, delivery_date.strftime('%d.%m.%Y'))
+            delivery_date_entry.insert(0, format_date(delivery_date))
         
         # --- Customer Selection (only for new orders) ---
         customer_cb = None
@@ -677,7 +953,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
             cust_frame.pack(fill='x', padx=10, pady=5)
             ttk.Label(cust_frame, text="Kunde:").pack(side='left', padx=5)
             customer_cb = AutocompleteCombobox(cust_frame, width=30)
-            customer_cb.set_completion_list(sorted(self.app.customers.keys()))
+            customer_cb.set_completion_index(self.app.customer_completion)
             customer_cb.pack(side='left', padx=5)
             if prefill_customer:
                 customer_cb.set(prefill_customer)
@@ -693,13 +969,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
         sub_type_frame.pack(fill='x', padx=5, pady=5)
         ttk.Label(sub_type_frame, text="Subscription Type:").pack(side='left', padx=5)
         
-        sub_types = {
-            0: "Kein Abonnement",
-            1: "Wöchentlich",
-            2: "Zweiwöchentlich",
-            3: "Alle 3 Wochen",
-            4: "Alle 4 Wochen"
-        }
+        sub_types = SUBSCRIPTION_TYPES
         
         # Create dropdown for subscription type instead of radio buttons
         sub_combo = ttk.Combobox(sub_type_frame, width=15, state="readonly")
@@ -740,13 +1010,13 @@ class WeeklyDeliveryView(WeeklyBaseView):
         
         # Set current subscription dates if editing
         if order and order.from_date and order.to_date:
-            from_date_entry.insert(0, order.from_date.strftime('%d.%m.%Y'))
-            to_date_entry.insert(0, order.to_date.strftime('%d.%m.%Y'))
+            from_date_entry.insert(0, format_date(order.from_date))
+            to_date_entry.insert(0, format_date(order.to_date))
         else:
             # Default dates for new orders
             today = datetime.now().date()
-            from_date_entry.insert(0, today.strftime('%d.%m.%Y'))
-            to_date_entry.insert(0, (today + timedelta(days=365)).strftime('%d.%m.%Y'))
+            from_date_entry.insert(0, format_date(today))
+            to_date_entry.insert(0, format_date(today + timedelta(days=365)))
         
         # Halbe Channel checkbox
         halbe_var = tk.BooleanVar(value=False if not order else order.halbe_channel)
@@ -761,11 +1031,21 @@ class WeeklyDeliveryView(WeeklyBaseView):
         scrollbar = ttk.Scrollbar(items_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
-        # Configure scrolling
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Configure scrolling. The scrollregion is updated once a burst of
+        # resizes is over (e.g. while the item rows are created), not per event.
+        scroll_state = {'after_id': None}
+        
+        def update_scrollregion():
+            scroll_state['after_id'] = None
+            if canvas.winfo_exists():
+                canvas.configure(scrollregion=canvas.bbox("all"))
+        
+        def schedule_scrollregion(event):
+            if scroll_state['after_id'] is not None:
+                canvas.after_cancel(scroll_state['after_id'])
+            scroll_state['after_id'] = canvas.after(50, update_scrollregion)
+        
+        scrollable_frame.bind("<Configure>", schedule_scrollregion)
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
@@ -779,7 +1059,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
             row_frame.pack(fill='x', pady=2)
             ttk.Label(row_frame, text="Artikel:").pack(side='left', padx=5)
             item_cb = AutocompleteCombobox(row_frame, width=20)
-            item_cb.set_completion_list(sorted(self.app.items.keys()))
+            item_cb.set_completion_index(self.app.item_completion)
             item_cb.pack(side='left', padx=5)
             if existing_order_item:
                 item_cb.set(existing_order_item.item.name)
@@ -802,12 +1082,17 @@ class WeeklyDeliveryView(WeeklyBaseView):
             item_rows.append(item_dict)
         
         if order:
-            # Sort order items alphabetically by item name
-            sorted_order_items = sorted(order.order_items, key=lambda item: item.item.name.lower())
+            # Sort order items alphabetically by item name; their items are
+            # joined in, so this is one query for the whole list
+            order_items = OrderItem.select(OrderItem, Item).join(Item).where(OrderItem.order == order)
+            sorted_order_items = sorted(order_items, key=lambda item: item.item.name.lower())
             for oi in sorted_order_items:
                 add_item_row(existing_order_item=oi)
+            # The items as loaded, to tell on save whether they were changed
+            original_items_signature = tuple(sorted((oi.item_id, float(oi.amount)) for oi in sorted_order_items))
         else:
             add_item_row()  # start with one empty item row
+            original_items_signature = ()
         
         add_item_btn = ttk.Button(edit_window, text="Artikel hinzufügen", command=lambda: add_item_row())
         add_item_btn.pack(pady=5)
@@ -838,7 +1123,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
                 # Parse the delivery date
                 new_date_str = delivery_date_entry.get()
                 try:
-                    new_date = datetime.strptime(new_date_str, "%d.%m.%Y").date()
+                    new_date = parse_date(new_date_str)
                 except ValueError:
                     messagebox.showerror("Fehler", f"Ungültiges Datumsformat. Verwenden Sie dd.mm.yyyy")
                     return
@@ -846,8 +1131,8 @@ class WeeklyDeliveryView(WeeklyBaseView):
                 # Parse subscription dates
                 if sub_var.get() > 0:  # If it's a subscription
                     try:
-                        from_date = datetime.strptime(from_date_entry.get(), "%d.%m.%Y").date()
-                        to_date = datetime.strptime(to_date_entry.get(), "%d.%m.%Y").date()
+                        from_date = parse_date(from_date_entry.get())
+                        to_date = parse_date(to_date_entry.get())
                         if from_date > to_date:
                             messagebox.showerror("Fehler", "Von-Datum muss vor Bis-Datum liegen")
                             return
@@ -861,16 +1146,15 @@ class WeeklyDeliveryView(WeeklyBaseView):
                 # Initialize order_obj with the existing order parameter
                 order_obj = order
                 
-                # Gather item data
+                # Gather item data: read all rows first, then validate them
+                entries = [(row['item_cb'].get(), row['amount_entry'].get().strip()) for row in item_rows]
+                items = self.app.items
                 order_items_data = []
-                for row in item_rows:
-                    item_name = row['item_cb'].get()
-                    
-                    # Get the amount string and validate before conversion
-                    amount_str = row['amount_entry'].get().strip()
+                for item_name, amount_str in entries:
+                    # Validate the amount string before conversion
                     
                     # Check for subscription type strings
-                    if amount_str in ["Wöchentlich", "Zweiwöchentlich", "Alle 3 Wochen", "Alle 4 Wochen", "Kein Abonnement"]:
+                    if amount_str in SUBSCRIPTION_LABELS:
                         messagebox.showerror("Fehler", 
                             f"Ungültige Menge: '{amount_str}' scheint ein Abonnementtyp zu sein statt einer Zahl für Artikel {item_name}")
                         return
@@ -888,14 +1172,52 @@ class WeeklyDeliveryView(WeeklyBaseView):
                         messagebox.showerror("Fehler", f"Ungültige Menge für Artikel {item_name}. Bitte geben Sie eine Zahl ein.")
                         return
                     
-                    if item_name not in self.app.items:
+                    if item_name not in items:
                         messagebox.showerror("Fehler", f"Ungültiger Artikel: {item_name}")
                         return
                     
                     order_items_data.append((item_name, amount))
                 
+                # Time before delivery of the production and from production to
+                # transfer of each item, computed once for all the orders
+                # written below
+                item_days = [
+                    (self.app.items[item_name], amount,
+                     timedelta(days=self.app.items[item_name].total_days),
+                     timedelta(days=self.app.items[item_name].germination_days))
+                    for item_name, amount in order_items_data
+                ]
+                
+                def order_item_rows(order_id, order_delivery_date):
+                    rows = []
+                    for item, amount, production_lead, transfer_lead in item_days:
+                        item_production_date = order_delivery_date - production_lead
+                        rows.append({
+                            'order': order_id,
+                            'item': item,
+                            'amount': amount,
+                            'production_date': item_production_date,
+                            'transfer_date': item_production_date + transfer_lead
+                        })
+                    return rows
+                
+                def insert_future_orders(future_orders):
+                    # Create the future orders, then copy the items to each of
+                    # them with its own dates (in batches, to stay below
+                    # SQLite's variable limit)
+                    future_items = []
+                    for batch in chunked(future_orders, 100):
+                        created = Order.insert_many(batch).returning(Order.id, Order.delivery_date).tuples().execute()
+                        for future_order_id, future_delivery_date in created:
+                            future_items.extend(order_item_rows(future_order_id, future_delivery_date))
+                    for batch in chunked(future_items, 100):
+                        OrderItem.insert_many(batch).execute()
+                
                 scope = update_type.get()  # Get the current selected scope
                 
+                # Take the undo data before anything is written
+                snapshot_for_undo()
+                
                 # Convert radio button values to our internal values
                 if scope == "current":
                     scope = "only_this"
@@ -928,21 +1250,10 @@ class WeeklyDeliveryView(WeeklyBaseView):
                         
                         # --- Update items for the current order ---
                         # (Existing logic to delete and recreate items for order_obj)
-                        for oi in order_obj.order_items:
-                            oi.delete_instance()
-                        for item_name, amount in order_items_data:
-                            item = self.app.items[item_name]
-                            total_days = item.germination_days + item.growth_days
-                            production_date = new_date - timedelta(days=total_days)
-                            transfer_date = production_date + timedelta(days=item.germination_days)
-                            OrderItem.create(
-                                order=order_obj,
-                                item=item,
-                                amount=amount,
-                                production_date=production_date,
-                                transfer_date=transfer_date
-                            )
-                            print(f"[DEBUG] Neues OrderItem gespeichert: {item.name}, Menge: {amount}, Prod: {production_date}, Trans: {transfer_date}")
+                        OrderItem.delete().where(OrderItem.order == order_obj).execute()
+                        rows = order_item_rows(order_obj.id, new_date)
+                        OrderItem.insert_many(rows).execute()
+                        logger.debug("Neue OrderItems gespeichert: %s", rows)
 
                         # --- Check if the order should be detached from subscription ---
                         should_detach = False
@@ -973,7 +1284,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
                             # Use the pre-edit date so we delete exactly those orders after the old schedule
                             print(f"Updating future orders starting from {order_obj.delivery_date}")
 
-                            future_orders_to_delete = Order.select().where(
+                            future_orders_to_delete = Order.select(Order.id).where(
                                     (Order.customer == order_obj.customer) &
                                     (Order.from_date   == original_from_date) &
                                     (Order.to_date     == original_to_date)   &
@@ -981,57 +1292,57 @@ class WeeklyDeliveryView(WeeklyBaseView):
                                     (Order.delivery_date > original_delivery_date) &
                                     (Order.id != order_obj.id)
                             )
-                            deleted_count = 0
-                            for future_order in future_orders_to_delete:
-                                future_order.delete_instance(recursive=True)
-                                deleted_count += 1
-                            print(f"Deleted {deleted_count} subsequent future orders.")
-
-                            # 2. Regenerate future orders based on the *updated* current order
-                            # Ensure the order has necessary subscription info before generating
-                            if order_obj.subscription_type > 0 and order_obj.from_date and order_obj.to_date:
-                                new_future_orders = generate_subscription_orders(order_obj)
-                                new_future_orders = [
-                                    fo for fo in new_future_orders
-                                    if fo['delivery_date'] > original_delivery_date
-                                    ]
-                                print(f"Regenerating {len(new_future_orders)} future orders.")
-                                
-                                # Get items from the *updated* current order
-                                current_items = list(order_obj.order_items)
-
-                                # 3. Create the new future orders
-                                created_count = 0
-                                for future_data in new_future_orders:
-                                    # Ensure we don't recreate an order for the same date if it somehow exists
-                                    if not Order.select().where(
-                                        (Order.customer == order_obj.customer) &
-                                        (Order.delivery_date == future_data['delivery_date']) &
-                                        (Order.from_date == future_data['from_date']) & # Match subscription range
-                                        (Order.to_date == future_data['to_date'])
-                                    ).exists():
-                                        new_future_order = Order.create(
-                                            **future_data,
-                                            order_id=uuid.uuid4()
-                                        )
-                                        # Copy items from the updated current order (including dates)
-                                        for item_data in current_items:
-                                            # calculate production & transfer dates
-                                            total_days      = item_data.item.germination_days + item_data.item.growth_days
-                                            production_date = new_future_order.delivery_date - timedelta(days=total_days)
-                                            transfer_date   = production_date + timedelta(days=item_data.item.germination_days)
-                                            OrderItem.create(
-                                                order=new_future_order,
-                                                item=item_data.item,
-                                                amount=item_data.amount,
-                                                production_date=production_date,
-                                                transfer_date=transfer_date
-                                            )
-
-                                        created_count += 1
-                                print(f"Created {created_count} new future orders.")
+
+                            # Same schedule and items: the future orders would be
+                            # regenerated as they are, so only copy the flag over
+                            new_items_signature = tuple(sorted((items[item_name].id, amount)
+                                                               for item_name, amount in order_items_data))
+                            if ((new_date, from_date, to_date, sub_var.get(), new_items_signature) ==
+                                    (original_delivery_date, original_from_date, original_to_date,
+                                     original_subscription_type, original_items_signature)):
+                                updated_count = (Order
+                                                 .update(halbe_channel=halbe_var.get())
+                                                 .where(Order.id.in_(future_orders_to_delete))
+                                                 .execute())
+                                print(f"Schedule and items unchanged, updated {updated_count} future orders.")
                             else:
-                                print("Skipping regeneration: Order is no longer part of a subscription.")
+                                # Delete their items and then the orders, one statement each
+                                OrderItem.delete().where(OrderItem.order.in_(future_orders_to_delete)).execute()
+                                deleted_count = Order.delete().where(Order.id.in_(future_orders_to_delete)).execute()
+                                print(f"Deleted {deleted_count} subsequent future orders.")
+
+                                # 2. Regenerate future orders based on the *updated* current order
+                                # Ensure the order has necessary subscription info before generating
+                                if order_obj.subscription_type > 0 and order_obj.from_date and order_obj.to_date:
+                                    new_future_orders = generate_subscription_orders(order_obj)
+                                    new_future_orders = [
+                                        fo for fo in new_future_orders
+                                        if fo['delivery_date'] > original_delivery_date
+                                        ]
+                                    print(f"Regenerating {len(new_future_orders)} future orders.")
+                                
+
+                                    # 3. Create the new future orders
+                                    future_orders = []
+                                    # Delivery dates and subscription ranges the customer
+                                    # already has orders for, read once for the whole loop
+                                    existing = set(Order.select(Order.delivery_date, Order.from_date, Order.to_date)
+                                                   .where(Order.customer == order_obj.customer)
+                                                   .tuples())
+                                    for future_data in new_future_orders:
+                                        # Ensure we don't recreate an order for the same date if it somehow exists
+                                        key = (future_data['delivery_date'], future_data['from_date'], future_data['to_date'])
+                                        if key not in existing:
+                                            existing.add(key)
+                                            # production_date is computed per item and is not an Order column
+                                            future_data.pop('production_date', None)
+                                            future_orders.append(dict(future_data, order_id=uuid.uuid4()))
+                                
+                                    # Insert them with the items of the updated current order
+                                    insert_future_orders(future_orders)
+                                    print(f"Created {len(future_orders)} new future orders.")
+                                else:
+                                    print("Skipping regeneration: Order is no longer part of a subscription.")
 
                     else: # Creating a new order
                         # Get customer from combobox if this is a new order
@@ -1065,45 +1376,19 @@ class WeeklyDeliveryView(WeeklyBaseView):
                         )
                         
                         # Create order items
-                        for item_name, amount in order_items_data:
-                            item = self.app.items[item_name]
-                            total_days = item.germination_days + item.growth_days
-                            production_date = new_date - timedelta(days=total_days)
-                            transfer_date = production_date + timedelta(days=item.germination_days)
-                            OrderItem.create(
-                                order=order_obj,
-                                item=item,
-                                amount=amount,
-                                production_date=production_date,
-                                transfer_date=transfer_date
-                            )
-                            print(f"[DEBUG] Neues OrderItem gespeichert: {item.name}, Menge: {amount}, Prod: {production_date}, Trans: {transfer_date}")
+                        rows = order_item_rows(order_obj.id, new_date)
+                        OrderItem.insert_many(rows).execute()
+                        logger.debug("Neue OrderItems gespeichert: %s", rows)
                             
                         # If it's a subscription, generate future orders
                         if sub_var.get() > 0:
-                            future_orders = generate_subscription_orders(order_obj)
+                            future_orders = []
+                            for future_data in generate_subscription_orders(order_obj):
+                                # production_date is computed per item and is not an Order column
+                                future_data.pop('production_date', None)
+                                future_orders.append(dict(future_data, order_id=uuid.uuid4()))
                             print(f"Generating {len(future_orders)} future orders for new subscription.")
-                            
-                            for future_data in future_orders:
-                                future_order = Order.create(
-                                    **future_data,
-                                    order_id=uuid.uuid4()
-                                )
-                                
-                                # Copy items to future order
-                                for item_name, amount in order_items_data:
-                                    item = self.app.items[item_name]
-                                    total_days = item.germination_days + item.growth_days
-                                    production_date = new_date - timedelta(days=total_days)
-                                    transfer_date = production_date + timedelta(days=item.germination_days)
-                                    OrderItem.create(
-                                        order=order_obj,
-                                        item=item,
-                                        amount=amount,
-                                        production_date=production_date,
-                                        transfer_date=transfer_date
-                                    )
-                                    print(f"[DEBUG] Neues OrderItem gespeichert: {item.name}, Menge: {amount}, Prod: {production_date}, Trans: {transfer_date}")
+                            insert_future_orders(future_orders)
 
 
                 # After successful save, notify the app for undo history if editing an existing order
@@ -1118,14 +1403,14 @@ class WeeklyDeliveryView(WeeklyBaseView):
                         if scope == "current":
                             # Single order edit - just send the original and updated order data
                             print(f"Calling edit callback for single order {order.id}")
-                            self.edit_callback(original_order_data, updated_order_data)
+                            self.edit_callback(undo_snapshot['order'], updated_order_data)
                         else:  # scope == "future"
                             # Multiple orders edit - send original order + future orders, and updated versions
                             print(f"Calling edit callback for order {order.id} plus future orders")
                             
                             # Combine the original order and future orders into a single undo record
                             combined_original_data = {
-                                'orders': [original_order_data] + original_future_orders_data
+                                'orders': [undo_snapshot['order']] + undo_snapshot['future']
                             }
                             
                             # Get all current orders in the subscription after our changes
@@ -1150,6 +1435,7 @@ class WeeklyDeliveryView(WeeklyBaseView):
                 
                 messagebox.showinfo("Erfolg", "Bestellung erfolgreich gespeichert!")
                 edit_window.destroy()
+                self.invalidate_cache()
                 self.refresh() # Refresh the current view
                 
                 # Also refresh the production and transfer views if they exist
@@ -1205,30 +1491,28 @@ class WeeklyDeliveryView(WeeklyBaseView):
                             current_weekday = order.delivery_date.weekday()
                             
                             # Get the items in this order to compare with other orders
-                            current_order_items = set()
-                            for order_item in order.order_items:
-                                current_order_items.add(order_item.item.id)
+                            current_order_items = frozenset(order_item.item_id for order_item in order.order_items)
                                 
                             # Get current date
                             today = datetime.now().date()
                             
-                            # Find all future orders with same customer, same weekday, and future dates
-                            future_orders_query = Order.select().where(
+                            # Find all future orders with same customer, same weekday, and future dates,
+                            # with their order items fetched in one more query
+                            future_orders_query = prefetch(Order.select().where(
                                 (Order.customer == order.customer) &
-                                (Order.delivery_date >= today)
-                            )
+                                (Order.delivery_date >= today) &
+                                on_weekday(Order.delivery_date, current_weekday)
+                            ), OrderItem)
                             
-                            # Filter for same weekday and identical items
+                            # Filter for identical items
                             matching_orders = []
                             for future_order in future_orders_query:
-                                # Check if same weekday
-                                if future_order.delivery_date.weekday() != current_weekday:
+                                # Check if the order has identical items; with fewer
+                                # items than the current order has distinct ones it cannot
+                                future_items = future_order.order_items
+                                if len(future_items) < len(current_order_items):
                                     continue
-                                
-                                # Check if the order has identical items
-                                order_items = set()
-                                for order_item in future_order.order_items:
-                                    order_items.add(order_item.item.id)
+                                order_items = {order_item.item_id for order_item in future_items}
                                 
                                 # Only include if items match exactly (same set of IDs)
                                 if order_items == current_order_items:
@@ -1253,122 +1537,128 @@ class WeeklyDeliveryView(WeeklyBaseView):
                             messagebox.showinfo("Erfolg", f"{deleted_count} Bestellung(en) erfolgreich gelöscht!")
                     
                     edit_window.destroy()
+                    self.invalidate_cache()
                     self.refresh()
 
             delete_btn = ttk.Button(buttons_frame, text="Delete Order", command=delete_order)
             delete_btn.pack(side='left', padx=5)
             
+class DayTable:
+    """
+    Table of item names and amounts in the frame of a day, with a message
+    in its place when it has no rows. The rows are entries of one Treeview,
+    not widgets of their own, and are kept from one refresh to the next:
+    only their texts change, rows are added or deleted as needed. The table
+    is packed with pack_options once it is filled.
+    """
+
+    def __init__(self, master, empty_text, **pack_options):
+        self.pack_options = pack_options
+        self.tree = ttk.Treeview(master, columns=('amount',), show='tree headings',
+                                 selectmode='none', height=0)
+        self.tree.heading('#0', text="Artikel", anchor='w')
+        self.tree.heading('amount', text="Menge", anchor='e')
+        self.tree.column('#0', minwidth=100, width=100, stretch=True)
+        self.tree.column('amount', minwidth=70, width=70, stretch=False, anchor='e')
+        self.tree.tag_configure('row', font=FONT_TEXT)
+        
+        self.empty_label = ttk.Label(master, text=empty_text, font=FONT_NOTE)
+        self.rows = []   # Treeview item ids of the rows, in order
+
+    def show(self, rows):
+        """Show (name, amount text) rows, or the message if there are none"""
+        tree = self.tree
+        if not rows:
+            tree.pack_forget()
+            if not self.empty_label.winfo_manager():
+                self.empty_label.pack(padx=5, pady=10, anchor='w')
+            return
+        self.empty_label.pack_forget()
+        
+        for i, (name, amount) in enumerate(rows):
+            if i < len(self.rows):
+                tree.item(self.rows[i], text=name, values=(amount,))
+            else:
+                self.rows.append(tree.insert('', 'end', text=name, values=(amount,), tags=('row',)))
+        
+        # Delete the rows left over from a longer table
+        if len(self.rows) > len(rows):
+            tree.delete(*self.rows[len(rows):])
+            del self.rows[len(rows):]
+        
+        # The day canvas scrolls, so the tree is as high as its rows
+        tree.configure(height=len(rows))
+        if not tree.winfo_manager():
+            tree.pack(fill='x', expand=True, **self.pack_options)
+
 class WeeklyProductionView(WeeklyBaseView):
     def __init__(self, parent, app=None, db=None):
         super().__init__(parent)
         self.app = app  # Store reference to main app
         self.db = db    # Store reference to database
         self.last_refresh_time = 0  # To track when we last refreshed
-        self.refresh_throttle = 1000  # minimum ms between refreshes
+        self.refresh_throttle = 1000  # minimum ms between refreshes, see timed_redraw
+        self.redraw_durations = deque(maxlen=REDRAW_SAMPLES)  # Seconds the last redraws took
+        self.pending_redraw_id = None  # Redraw delayed by the throttle
+        self.shown_key = None  # (monday, data_version()) of the week shown
+        # Tables of the days, whose rows are reused by every redraw
+        self.day_tables = {day: DayTable(self.day_frames[day], "No production items", padx=5, pady=5)
+                           for day in DAYS}
+        self.sunday_note = ttk.Label(self.day_frames['Sonntag'],
+                                     text="Hinweis: Keine Sonntagsproduktionsdaten in der Datenbank gefunden",
+                                     font=FONT_SMALL,
+                                     foreground='red')
         self.refresh()
         
     def refresh(self):
-        # Add throttling to prevent excessive refreshes
-        current_time = int(time.time() * 1000)  # Current time in ms
-        if current_time - self.last_refresh_time < self.refresh_throttle:
-            # Skip this refresh if it's too soon after the last one
+        # Nothing to do if the week shown is up to date
+        if self.shown_key is not None and self.shown_key == self.week_key():
             return
-            
-        self.last_refresh_time = current_time
-        self.clear_day_frames()
+        # Throttle to prevent excessive refreshes
+        self.throttle(self.redraw)
+
+    def redraw(self):
         monday = self.get_monday_of_week()
         end_of_week = monday + timedelta(days=6)
+        self.shown_key = self.week_key()
+        self.sunday_note.pack_forget()
         
         # Get all production tasks for the week
-        all_production_items = OrderItem.select().count()
         production_data = get_production_plan(monday, end_of_week)
-        #rint(f"[DEBUG] ProductionView refreshed: {len(production_data)} of {all_production_items} OrderItems matched")
-        for prod in production_data:
-            try:
-                print(f"[DEBUG] UI-Produktionseintrag: {prod.item.name}, {prod.production_date}, {prod.total_amount}")
-            except Exception as e:
-                print(f"[WARN] defektes OrderItem: ID={getattr(prod, 'id', None)}, Fehler: {e}")
-
+        logger.debug("ProductionView refreshed: %d Produktionseinträge", len(production_data))
         
-        # Group by day
-        days = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+        # Group by day, in one pass over the plan
+        days = DAYS
+        production_by_weekday = defaultdict(list)
+        for prod in production_data:
+            production_by_weekday[prod.production_date.weekday()].append(prod)
 
         # Track if we have any items for each day, particularly Sunday
-        day_has_items = {day: False for day in days}
+        day_has_items = {day: i in production_by_weekday for i, day in enumerate(days)}
 
         for i, day in enumerate(days):
             date = monday + timedelta(days=i)
-            date_str = date.strftime('%d.%m')
+            date_str = f"{date.day:02d}.{date.month:02d}"
             day_label = f"{day} ({date_str})"
             
             # Update day labels
             if day in self.day_labels:
                 self.day_labels[day].configure(text=day_label)
             
-            # Get the frame for this day
-            frame = self.day_frames[day]
-            
-            # Filter production items for this day
-            day_production = []
-            for prod in production_data:
-                #aay---> if prod.production_date.weekday() == i:
-                if prod.production_date.weekday() == i:
-                    day_production.append(prod)
-                    day_has_items[day] = True
+            # Production items for this day
+            day_production = production_by_weekday.get(i, [])
             
-            # If no items for this day, add a message
-            if not day_production:
-                no_items_label = ttk.Label(frame, text="No production items", font=('Arial', 10, 'italic'))
-                no_items_label.pack(padx=5, pady=10, anchor='w')
-                continue
-                
-            # Create a main container frame for items
-            main_container = ttk.Frame(frame)
-            main_container.pack(fill='both', expand=True)
-            
-            # Create a frame for all items
-            items_frame = ttk.Frame(main_container)
-            items_frame.pack(fill='x', expand=True, padx=5, pady=5)
-            
-            # Configure grid columns for item layout
-            items_frame.columnconfigure(0, weight=1, minsize=100)  # Item column
-            items_frame.columnconfigure(1, weight=0, minsize=70)   # Amount column
-            
-            # Add headers
-            ttk.Label(items_frame, text="Artikel", font=('Arial', 11, 'bold')).grid(row=0, column=0, sticky='w', padx=5, pady=3)
-            ttk.Label(items_frame, text="Menge", font=('Arial', 11, 'bold')).grid(row=0, column=1, sticky='e', padx=5, pady=3)
-            
-            # Add separator
-            separator = ttk.Separator(items_frame, orient='horizontal')
-            separator.grid(row=1, column=0, columnspan=2, sticky='ew', padx=3, pady=2)
-            
-            # Sort items alphabetically by name
-            #aay---> sorted_items = sorted(day_production, key=lambda x: x.item.name.lower())
-            ##aay--->sorted_items = sorted(day_production, key=lambda x: x["item"].lower())
-            # sortiert zuerst nach Kunde, dann nach Item-Name
-            sorted_items = sorted(
-            day_production,
-            key=lambda x: (
-                getattr(x.order.customer, 'name', '').lower() if x.order and x.order.customer_id else '',
-                x.item.name.lower()
-                )
-            )
-
-            # Add each production item in a grid layout
-            row_index = 2  # Start after header and separator
-            for prod in sorted_items:
-                # Item name
-                #aay---> item_label = ttk.Label(items_frame, text=prod.item.name, font=('Arial', 10))
-                item_label = ttk.Label(items_frame, text=prod.item.name, font=('Arial', 10))
-                item_label.grid(row=row_index, column=0, sticky='w', padx=5, pady=2)
-                
-                # Amount with right alignment
-                #aay---> amount_label = ttk.Label(items_frame, text=f"{prod.total_amount:.1f}", font=('Arial', 10))
-                amount_value = getattr(prod, 'total_amount', 0.0)
-                amount_label = ttk.Label(items_frame, text=f"{amount_value:.1f}", font=('Arial', 10))
-                amount_label.grid(row=row_index, column=1, sticky='e', padx=5, pady=2)
-                
-                row_index += 1
+            # Sort items alphabetically by name. The plan rows are totals over
+            # all customers, so they carry no customer to sort by (the key
+            # used to look one up and always got none); sort by the item name
+            # that is loaded with them
+            sorted_items = sorted(day_production, key=lambda x: x.item.name.lower())
+
+            # Show the items in the day's table, or a message if there are none
+            self.day_tables[day].show([
+                (prod.item.name, f"{getattr(prod, 'total_amount', 0.0):.1f}")
+                for prod in sorted_items
+            ])
             
         # After processing all days, check if Sunday has no items consistently
         if not day_has_items['Sonntag']:
@@ -1376,16 +1666,22 @@ class WeeklyProductionView(WeeklyBaseView):
             # This is diagnostic code to help understand why Sundays might be empty
             today = datetime.now().date()
             sunday_check_date = today - timedelta(days=today.weekday()) + timedelta(days=6)  # Next Sunday
-            sunday_check = get_production_plan(sunday_check_date, sunday_check_date)
+            # In the current week that Sunday was just found empty; otherwise
+            # it is enough to know whether anything is produced on it
+            if sunday_check_date == end_of_week:
+                sunday_has_items = False
+            else:
+                sunday_has_items = (OrderItem
+                                    .select(OrderItem.id)
+                                    .join(Order)
+                                    .switch(OrderItem)
+                                    .join(Item)
+                                    .where(OrderItem.production_date == sunday_check_date)
+                                    .exists())
             
-            if not list(sunday_check):
+            if not sunday_has_items:
                 # If still no Sunday items, let's add a diagnostic message just for this view
-                sunday_frame = self.day_frames['Sonntag']
-                diagnostic_label = ttk.Label(sunday_frame, 
-                                           text="Hinweis: Keine Sonntagsproduktionsdaten in der Datenbank gefunden", 
-                                           font=('Arial', 9), 
-                                           foreground='red')
-                diagnostic_label.pack(padx=5, pady=5, anchor='w')
+                self.sunday_note.pack(padx=5, pady=5, anchor='w')
                     
 class WeeklyTransferView(WeeklyBaseView):
     def __init__(self, parent, app=None, db=None):
@@ -1393,70 +1689,57 @@ class WeeklyTransferView(WeeklyBaseView):
         self.app = app  # Store reference to main app
         self.db = db    # Store reference to database
         self.last_refresh_time = 0  # To track when we last refreshed
-        self.refresh_throttle = 1000  # minimum ms between refreshes
+        self.refresh_throttle = 1000  # minimum ms between refreshes, see timed_redraw
+        self.redraw_durations = deque(maxlen=REDRAW_SAMPLES)  # Seconds the last redraws took
+        self.pending_redraw_id = None  # Redraw delayed by the throttle
+        self.shown_key = None  # (monday, data_version()) of the week shown
+        # Tabellen der Tage, deren Zeilen bei jedem Neuzeichnen wiederverwendet werden
+        self.day_tables = {day: DayTable(self.day_frames[day], "Keine Transfers")
+                           for day in DAYS}
         self.refresh()
 
     def refresh(self):
-        # Add throttling to prevent excessive refreshes
-        current_time = int(time.time() * 1000)
-        if current_time - self.last_refresh_time < self.refresh_throttle:
+        # Nothing to do if the week shown is up to date
+        if self.shown_key is not None and self.shown_key == self.week_key():
             return
+        # Throttle to prevent excessive refreshes
+        self.throttle(self.redraw)
 
-        self.last_refresh_time = current_time
-        self.clear_day_frames()
+    def redraw(self):
         monday = self.get_monday_of_week()
         end_of_week = monday + timedelta(days=6)
+        self.shown_key = self.week_key()
 
         # Hole aggregierte Transferdaten
         transfer_data = get_transfer_schedule(monday, end_of_week)
-        print(f"[DEBUG] TransferView refreshed: {len(transfer_data)} Transfers aggregiert")
+        logger.debug("TransferView refreshed: %d Transfers aggregiert", len(transfer_data))
 
-        days = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+        days = DAYS
+
+        # Nach Wochentag gruppieren, in einem Durchlauf
+        transfers_by_weekday = defaultdict(list)
+        for transfer in transfer_data:
+            transfers_by_weekday[transfer['date'].weekday()].append(transfer)
 
         for i, day in enumerate(days):
             date = monday + timedelta(days=i)
-            date_str = date.strftime('%d.%m')
+            date_str = f"{date.day:02d}.{date.month:02d}"
             day_label = f"{day} ({date_str})"
 
             # Update Tag-Label
             if day in self.day_labels:
                 self.day_labels[day].configure(text=day_label)
 
-            frame = self.day_frames[day]
-
-            # Filter nach Tagestransfers
-            day_transfers = [t for t in transfer_data if t['date'].weekday() == i]
-
-            if not day_transfers:
-                no_items_label = ttk.Label(frame, text="Keine Transfers", font=('Arial', 10, 'italic'))
-                no_items_label.pack(padx=5, pady=10, anchor='w')
-                continue
+            # Transfers des Tages
+            day_transfers = transfers_by_weekday.get(i, [])
 
             # Sortiere nach Artikelname
             day_transfers.sort(key=lambda x: x['item'].lower())
 
-            # Layout-Spalten konfigurieren
-            frame.columnconfigure(0, weight=1, minsize=100)  # Artikel
-            frame.columnconfigure(1, weight=0, minsize=70)   # Menge
-
-            # Überschriften
-            ttk.Label(frame, text="Artikel", font=('Arial', 11, 'bold')).grid(row=0, column=0, sticky='w', padx=5, pady=5)
-            ttk.Label(frame, text="Menge", font=('Arial', 11, 'bold')).grid(row=0, column=1, sticky='e', padx=5, pady=5)
-
-            # Trennlinie
-            separator = ttk.Separator(frame, orient='horizontal')
-            separator.grid(row=1, column=0, columnspan=2, sticky='ew', padx=3, pady=2)
-
-            # Transfers anzeigen
-            row_index = 2
-            for transfer in day_transfers:
-                item_label = ttk.Label(frame, text=transfer['item'], font=('Arial', 10))
-                item_label.grid(row=row_index, column=0, sticky='w', padx=5, pady=2)
-
-                amount_label = ttk.Label(frame, text=f"{transfer['amount']:.1f}", font=('Arial', 10))
-                amount_label.grid(row=row_index, column=1, sticky='e', padx=5, pady=2)
-
-                row_index += 1
+            # In der Tabelle des Tages anzeigen, oder einen Hinweis, wenn es keine gibt
+            self.day_tables[day].show([
+                (transfer['item'], f"{transfer['amount']:.1f}") for transfer in day_transfers
+            ])
 
 
     """ def refresh(self):
@@ -1611,5 +1894,12 @@ class WeeklyTransferView(WeeklyBaseView):
                         row_index += 1 """
 
 def format_date(date):
-    """Format date as DD.MM.YYYY"""
-    return date.strftime('%d.%m.%Y')
\ No newline at end of file
+    """Format date as DD.MM.YYYY (DATE_FORMAT)"""
+    return f"{date.day:02d}.{date.month:02d}.{date.year}"
+
+def parse_date(text):
+    """Parse a DD.MM.YYYY (DATE_FORMAT) date; ValueError if text is not one"""
+    day, month, year = text.split('.')
+    if not (day.isdigit() and month.isdigit() and year.isdigit() and len(year) == 4):
+        raise ValueError(f"time data {text!r} does not match format {DATE_FORMAT!r}")
+    return date(int(year), int(month), int(day))
\ No newline at end of file
@@ -1,42 +1,92 @@
 import tkinter as tk
 from tkinter import ttk
+from bisect import bisect_left
+from heapq import nsmallest
+
+# Time (ms) after the last keystroke before the suggestions are filtered
+FILTER_DELAY = 120
+
+# Most suggestions shown for a text, so a short text does not fill the
+# dropdown with the whole list
+MAX_HITS = 50
+
+class CompletionIndex:
+    """
+    The values of an autocomplete box with the lookup index over them.
+    It is not changed after it is built, so the boxes offering the same
+    values can share one instead of each indexing the values again.
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+        # Sorted (suffix, value index) pairs of all values, casefolded: the
+        # values containing a text are those with a suffix starting with it,
+        # so a keystroke only has to look up the range of the typed text
+        self._index = sorted((folded[i:], index) for index, value in enumerate(self.values)
+                             for folded in (value.casefold(),) for i in range(len(folded)))
+        self._keys = [key for key, _ in self._index]
+
+    def matches(self, text, limit=MAX_HITS):
+        """The first limit values containing text (casefolded), in order"""
+        lo = bisect_left(self._keys, text)
+        hi = bisect_left(self._keys, text + '\uffff')
+        indices = nsmallest(limit, {index for _, index in self._index[lo:hi]})
+        return [self.values[index] for index in indices]
 
 class AutocompleteCombobox(ttk.Combobox):
     def __init__(self, master, completevalues=None, **kwargs):
         super().__init__(master, **kwargs)
-        self.completevalues = completevalues or []
         self._hits = []
-        self['values'] = self.completevalues
+        self._filter_after_id = None  # Pending _filter after a keystroke
+        self.set_completion_list(completevalues or [])
 
         # Bind key events:
         self.bind('<KeyRelease>', self._key_release)
         self.bind('<Tab>', self._handle_tab_key)
         self.bind('<Return>', self._select_and_next)
-        # Let arrow keys be handled by the default behavior.
+        # Let arrow keys be handled by the default behavior, with the
+        # suggestions for the text typed so far.
+        self.bind('<Down>', lambda event: self._flush_filter())
 
     def _key_release(self, event):
         # Ignore keys that we want the widget to handle normally.
         if event.keysym in ('Tab', 'Return', 'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Up', 'Down'):
             return
 
-        # Get the current text in lowercase.
-        value = self.get().lower()
+        # Filter once typing pauses, not on every key of a burst
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(FILTER_DELAY, self._filter)
+
+    def _filter(self):
+        """Show the values that match the current text"""
+        self._filter_after_id = None
+
+        # Get the current text, case-insensitive.
+        value = self.get().casefold()
 
         # If empty, restore full list.
         if not value:
-            self['values'] = self.completevalues
+            self._set_values(self.completevalues)
             return
 
-        # Filter completevalues for matches.
-        self._hits = [item for item in self.completevalues if value in item.lower()]
-        self['values'] = self._hits
+        # Values containing the text
+        self._hits = self._completion.matches(value)
+        self._set_values(self._hits)
 
         # If there are matches, open the dropdown list.
        # if self._hits:
        #     self.event_generate('<Down>')
 
+    def _flush_filter(self):
+        """Run a pending filter now, so the suggestions match the text"""
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+            self._filter()
+
     def _handle_tab_key(self, event):
         # Mimic the behavior of the Down key to open the dropdown
+        self._flush_filter()
         if self._hits:
             self.event_generate('<Down>')
         return 'break'  # Prevent default tab behavior
@@ -46,6 +96,8 @@ class AutocompleteCombobox(ttk.Combobox):
         On Tab/Return, if a suggestion is highlighted (or if none is highlighted, use the first),
         then set the entry's value to that suggestion.
         """
+        self._flush_filter()
+
         # Try to get the current highlighted index.
         try:
             index = self.current()
@@ -58,7 +110,7 @@ class AutocompleteCombobox(ttk.Combobox):
                 self.set(self._hits[0])
         else:
             # Use the highlighted suggestion.
-            values = list(self['values'])
+            values = self._shown_values
             if index < len(values):
                 self.set(values[index])
 
@@ -68,7 +120,26 @@ class AutocompleteCombobox(ttk.Combobox):
         self.event_generate('<Tab>')
         return "break"
 
+    def destroy(self):
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+            self._filter_after_id = None
+        super().destroy()
+
     def set_completion_list(self, completion_list):
         """Update the list of possible completions."""
-        self.completevalues = completion_list
-        self['values'] = completion_list
\ No newline at end of file
+        self.set_completion_index(CompletionIndex(completion_list))
+
+    def set_completion_index(self, completion):
+        """Use the values of a CompletionIndex, which may be shared"""
+        self._completion = completion
+        self.completevalues = completion.values
+        self._shown_values = None
+        self._set_values(completion.values)
+
+    def _set_values(self, values):
+        """Show values in the dropdown, unless it already shows them"""
+        values = tuple(values)
+        if values != self._shown_values:
+            self['values'] = values
+            self._shown_values = values
\ No newline at end of file